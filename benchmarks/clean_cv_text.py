@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: CV text normalizer against the previous clean_cv_text.
+
+Usage:
+    python -m benchmarks.clean_cv_text [--dir PATH] [--docs N] [--repeat N]
+
+With --dir, every .txt/.pdf/.docx CV in the directory is extracted once and
+used as the corpus; otherwise a synthetic corpus of CV-like documents with
+form feeds, tabs, Unicode spaces, ligatures and hyphenated line breaks is
+generated.
+"""
+import os
+import sys
+import random
+import argparse
+import statistics
+import timeit
+
+from utils.text_normalizer import normalize_cv_text
+
+def legacy_clean_cv_text(text):
+    """clean_cv_text as it was before the single-pass normalizer"""
+    import re
+    text = re.sub(r'\n+', '\n', text)
+    text = re.sub(r' +', ' ', text)
+    text = text.replace('\x0c', ' ').replace('\t', ' ')
+    return text.strip()
+
+_WORDS = (
+    "led product engineering team scaled revenue growth market customers "
+    "managed fundraising strategy operations analytics platform launched "
+    "partnerships acquisition retention international expansion"
+).split()
+
+def synthetic_cv(rng, lines=120):
+    parts = []
+    for i in range(lines):
+        words = rng.choices(_WORDS, k=rng.randint(4, 14))
+        line = " ".join(words)
+        if i % 7 == 0:
+            line = line.replace("fi", "\ufb01").replace("fl", "\ufb02")
+        if i % 5 == 0:
+            line = line.replace(" ", "\t", 2)
+        if i % 9 == 0:
+            line = line.replace(" ", "\xa0", 1)
+        if i % 11 == 0:
+            line += " manage-"
+            parts.append(line + "\n")
+            parts.append("ment of  the   team\n")
+            continue
+        parts.append(line + ("\n\n" if i % 4 == 0 else "\n"))
+        if i % 40 == 39:
+            parts.append("\x0c")
+    return "".join(parts)
+
+def load_corpus(directory):
+    from services.cv_extract import extract_text
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if os.path.splitext(name)[1].lower() in (".txt", ".pdf", ".docx"):
+            corpus.append(extract_text(os.path.join(directory, name)))
+    return corpus
+
+def bench(func, corpus, repeat):
+    runs = timeit.repeat(lambda: [func(text) for text in corpus], number=1, repeat=repeat)
+    return min(runs), statistics.median(runs)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CV text normalization")
+    parser.add_argument("--dir", help="Directory of sample CVs")
+    parser.add_argument("--docs", type=int, default=500, help="Synthetic documents to generate")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if args.dir:
+        corpus = load_corpus(args.dir)
+    else:
+        rng = random.Random(42)
+        corpus = [synthetic_cv(rng) for _ in range(args.docs)]
+    total_chars = sum(len(text) for text in corpus)
+    print(f"Corpus: {len(corpus)} documents, {total_chars / 1e6:.2f}M characters")
+
+    results = {}
+    for name, func in (("legacy", legacy_clean_cv_text), ("normalizer", normalize_cv_text)):
+        best, median = bench(func, corpus, args.repeat)
+        results[name] = best
+        print(f"{name:>10}: best {best * 1000:8.2f} ms  median {median * 1000:8.2f} ms  "
+              f"{total_chars / best / 1e6:7.1f} M chars/s")
+    print(f"Speedup: {results['legacy'] / results['normalizer']:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
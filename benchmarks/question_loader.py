@@ -0,0 +1,88 @@
+"""
+Startup benchmark: loading the question CSV with pandas vs. the csv module.
+
+Usage:
+    python -m benchmarks.question_loader [--csv PATH] [--runs N]
+
+Each measurement runs in a fresh interpreter so import cost is included,
+the way a newly scaled-up worker pays it. config is imported before timing
+starts in every run (the app always loads it), so the numbers are the
+marginal cost of each loader. Reports wall time to load the questions and
+peak RSS of the process.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+from config import settings
+
+_PRELUDE = """
+import json, resource, time
+import config
+"""
+
+_PANDAS = _PRELUDE + """
+t = time.perf_counter()
+import pandas as pd
+df = pd.read_csv({path!r})
+questions = df['Question'].tolist()
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "rows": len(questions)}}))
+"""
+
+_CSV = _PRELUDE + """
+t = time.perf_counter()
+from services.question_bank import QuestionBank, read_question_csv
+bank = QuestionBank(read_question_csv({path!r}))
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "rows": len(bank)}}))
+"""
+
+_BASELINE = _PRELUDE + """
+print(json.dumps({"seconds": 0.0, "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "rows": 0}))
+"""
+
+def measure(code, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True, cwd=os.getcwd()
+        ).stdout.strip().splitlines()[-1]
+        results.append(json.loads(output))
+    return {
+        "seconds": statistics.median(r["seconds"] for r in results),
+        "rss_mb": statistics.median(r["rss_kb"] for r in results) / 1024,
+        "rows": results[-1]["rows"]
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark question CSV loading at startup")
+    parser.add_argument("--csv", default=settings.QUESTIONS_CSV)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    baseline = measure(_BASELINE, args.runs)
+    print(f"Baseline RSS (interpreter + config): {baseline['rss_mb']:.1f} MB")
+    loaders = [("csv", _CSV), ("pandas", _PANDAS)]
+    results = {}
+    for name, template in loaders:
+        try:
+            results[name] = measure(template.format(path=args.csv), args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:>7}: failed ({e.stderr.strip().splitlines()[-1] if e.stderr else e})")
+            continue
+        r = results[name]
+        print(f"{name:>7}: {r['seconds'] * 1000:8.1f} ms  peak RSS {r['rss_mb']:6.1f} MB "
+              f"(+{r['rss_mb'] - baseline['rss_mb']:.1f} MB)  {r['rows']} questions")
+
+    if len(results) == 2:
+        print(f"csv loader is {results['pandas']['seconds'] / results['csv']['seconds']:.1f}x faster "
+              f"and uses {results['pandas']['rss_mb'] - results['csv']['rss_mb']:.1f} MB less RSS")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
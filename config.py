@@ -35,11 +35,36 @@ class Settings(BaseSettings):
     # File paths
     QUESTIONS_CSV: str = os.getenv("QUESTIONS_CSV", "data/questions.csv")
     questions_csv_path: str = os.getenv("QUESTIONS_CSV_PATH", "vc_interview_questions_full.csv")
+    QUESTION_BANK_CHECK_INTERVAL: float = float(os.getenv("QUESTION_BANK_CHECK_INTERVAL", "5"))  # Seconds between CSV mtime checks
+    QUESTION_SELECT_HISTORY: int = int(os.getenv("QUESTION_SELECT_HISTORY", "3"))  # Recent responses used to pick the next question
+    QUESTION_RERANK_WITH_LLM: bool = os.getenv("QUESTION_RERANK_WITH_LLM", "false").lower() in ["true", "1", "yes"]
+    QUESTION_RERANK_TOP_K: int = int(os.getenv("QUESTION_RERANK_TOP_K", "3"))  # Candidates passed to Gemini when re-ranking
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    CV_STORE_DIR: str = os.getenv("CV_STORE_DIR", "uploads/cvs")  # CVs stored by content hash
+    CV_EXTRACT_WORKERS: int = int(os.getenv("CV_EXTRACT_WORKERS", "2"))  # Processes parsing CVs
+    CV_EXTRACT_TIMEOUT: float = float(os.getenv("CV_EXTRACT_TIMEOUT", "30"))  # Seconds before a parse is abandoned
+    CV_MAX_PAGES: int = int(os.getenv("CV_MAX_PAGES", "50"))  # Pages beyond this are ignored
+    CV_PAGES_PER_TASK: int = int(os.getenv("CV_PAGES_PER_TASK", "8"))  # PDF pages per parallel extraction task
+    CV_JOB_WORKERS: int = int(os.getenv("CV_JOB_WORKERS", "4"))  # Background CV question jobs
+    MAX_UPLOAD_MB: int = int(os.getenv("MAX_UPLOAD_MB", "20"))
+    CV_BATCH_MAX_UNPACKED_MB: int = int(os.getenv("CV_BATCH_MAX_UNPACKED_MB", "1024"))  # Total CV bytes unpacked from one zip archive
+    UPLOAD_CHUNK_BYTES: int = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
     
     # Session storage
     SESSION_DIR: str = os.getenv("SESSION_DIR", "sessions")
     sessions_dir: str = os.getenv("SESSIONS_DIR", "sessions")
-    
+    SESSION_SHARD_LEVELS: int = int(os.getenv("SESSION_SHARD_LEVELS", "2"))  # Levels of 256-way directory fan-out
+    SESSION_LOG_FSYNC_EVERY: int = int(os.getenv("SESSION_LOG_FSYNC_EVERY", "8"))  # Events per fsync
+    SESSION_LOG_FSYNC_INTERVAL: float = float(os.getenv("SESSION_LOG_FSYNC_INTERVAL", "1.0"))  # Max seconds between fsyncs
+    SESSION_LOG_COMPACT_EVERY: int = int(os.getenv("SESSION_LOG_COMPACT_EVERY", "64"))  # Events before snapshotting
+    SESSION_LOG_MAX_OPEN: int = int(os.getenv("SESSION_LOG_MAX_OPEN", "256"))
+    SESSION_STORE: str = os.getenv("SESSION_STORE", "file")  # file or sqlite
+    SESSION_DB_PATH: str = os.getenv("SESSION_DB_PATH", "data/sessions.db")
+    SESSION_INDEX_PATH: str = os.getenv("SESSION_INDEX_PATH", "data/session_index.db")  # Listing index for the file store
+    SESSION_CACHE_MAX_ENTRIES: int = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "1000"))  # Sessions kept in memory
+    SESSION_CACHE_IDLE_TTL: int = int(os.getenv("SESSION_CACHE_IDLE_TTL", "1800"))  # Seconds before an idle session is evicted
+    SESSION_CACHE_SWEEP_INTERVAL: int = int(os.getenv("SESSION_CACHE_SWEEP_INTERVAL", "60"))  # Seconds between idle-session sweeps
+
     # Model configuration
     generative_model_name: str = os.getenv("GENERATIVE_MODEL_NAME", "gemini-1.5-pro-latest")
     
@@ -50,10 +75,31 @@ class Settings(BaseSettings):
     # Performance settings
     ENABLE_CACHING: bool = os.getenv("ENABLE_CACHING", "true").lower() in ["true", "1", "yes"]
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour default
-    
+    AUDIO_CACHE_DIR: str = os.getenv("AUDIO_CACHE_DIR", "cache/audio")
+    AUDIO_CACHE_MEMORY_MB: int = int(os.getenv("AUDIO_CACHE_MEMORY_MB", "64"))
+    AUDIO_CACHE_DISK_MB: int = int(os.getenv("AUDIO_CACHE_DISK_MB", "512"))
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.db")  # Cached responses of deterministic Gemini calls
+    LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "64"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "86400"))  # Seconds a cached response stays valid
+    AUDIO_STORE_DIR: str = os.getenv("AUDIO_STORE_DIR", "audio_store")  # Pre-rendered question audio
+    AUDIO_STORE_VERSION: str = os.getenv("AUDIO_STORE_VERSION", "v1")
+    PRERENDER_WORKERS: int = int(os.getenv("PRERENDER_WORKERS", "4"))
+
+    # LLM execution settings (blocking Gemini calls run on a bounded thread pool)
+    LLM_MAX_WORKERS: int = int(os.getenv("LLM_MAX_WORKERS", "8"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    ANALYSIS_MAX_CONCURRENCY: int = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "5"))  # Per-answer analyses in flight per feedback request
+    ANALYSIS_CALL_TIMEOUT: float = float(os.getenv("ANALYSIS_CALL_TIMEOUT", "60"))  # Seconds before one analysis call is abandoned
+    SINGLE_FLIGHT_TIMEOUT: float = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "120"))  # Seconds a caller waits on an identical Gemini/TTS call in flight
+    SENTIMENT_GEMINI_ENRICHMENT: bool = os.getenv("SENTIMENT_GEMINI_ENRICHMENT", "false").lower() in ["true", "1", "yes"]  # Deep Gemini analysis of each answer in the background
+
     # Speech service config
     TTS_VOICE: str = os.getenv("TTS_VOICE", "en-US-Studio-O")
     STT_MODEL: str = os.getenv("STT_MODEL", "latest_long")
+    TTS_VOICE_CACHE_TTL: int = int(os.getenv("TTS_VOICE_CACHE_TTL", "3600"))  # Voice list refresh interval
+    TTS_MAX_WORKERS: int = int(os.getenv("TTS_MAX_WORKERS", "8"))
+    TTS_MAX_CONCURRENCY: int = int(os.getenv("TTS_MAX_CONCURRENCY", "16"))
+    TTS_STREAM_CHUNK_CHARS: int = int(os.getenv("TTS_STREAM_CHUNK_CHARS", "300"))  # Max characters per streamed chunk
     
     # CORS settings
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "*").split(",")
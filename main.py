@@ -1,4 +1,5 @@
 import os
+import asyncio
 import logging
 import time
 import traceback
@@ -75,7 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Voice-Used", "X-Voice-Type"]  # Expose custom headers for the frontend
+    expose_headers=["X-Voice-Used", "X-Voice-Type", "ETag", "X-Audio-Chunks", "X-Time-To-First-Byte", "Server-Timing"]  # Expose custom headers for the frontend
 )
 
 # Add GZip compression
@@ -117,11 +118,74 @@ async def health_check():
         logger.error(f"Google Cloud health check failed: {e}")
         google_cloud_status = "error"
     
+    # Report load on the LLM executor
+    llm_status = {}
+    try:
+        from utils.async_executor import llm_executor
+        llm_status = llm_executor.get_status()
+    except Exception as e:
+        logger.error(f"LLM executor status check failed: {e}")
+    
+    # Report in-memory session cache usage
+    session_cache_status = {}
+    try:
+        from routers.interview import active_sessions
+        session_cache_status = active_sessions.get_stats()
+    except Exception as e:
+        logger.error(f"Session cache status check failed: {e}")
+    
+    # Report synthesized audio cache usage
+    audio_cache_status = {}
+    try:
+        from utils.audio_cache import audio_cache
+        audio_cache_status = audio_cache.get_stats()
+    except Exception as e:
+        logger.error(f"Audio cache status check failed: {e}")
+    
+    # Report coalesced Gemini and TTS calls
+    single_flight_status = {}
+    try:
+        from utils.single_flight import llm_flight, tts_flight
+        single_flight_status = {"llm": llm_flight.get_stats(), "tts": tts_flight.get_stats()}
+    except Exception as e:
+        logger.error(f"Single-flight status check failed: {e}")
+    
+    # Report cached Gemini responses
+    llm_cache_status = {}
+    try:
+        from utils.llm_cache import llm_cache
+        llm_cache_status = llm_cache.get_stats()
+    except Exception as e:
+        logger.error(f"LLM cache status check failed: {e}")
+    
+    # Report CV store deduplication and memoization
+    cv_store_status = {}
+    try:
+        from services.cv_store import cv_store
+        cv_store_status = cv_store.get_stats()
+    except Exception as e:
+        logger.error(f"CV store status check failed: {e}")
+    
+    # Report local question selection
+    question_selector_status = {}
+    try:
+        from services.question_selector import question_selector
+        question_selector_status = question_selector.get_stats()
+    except Exception as e:
+        logger.error(f"Question selector status check failed: {e}")
+    
     return {
         "status": "healthy",
         "timestamp": time.time(),
         "google_cloud": google_cloud_status,
         "cloud_services": cloud_details,
+        "llm_executor": llm_status,
+        "audio_cache": audio_cache_status,
+        "llm_cache": llm_cache_status,
+        "single_flight": single_flight_status,
+        "session_cache": session_cache_status,
+        "cv_store": cv_store_status,
+        "question_selector": question_selector_status,
         "environment": getattr(settings, "ENVIRONMENT", "production")
     }
 
@@ -146,6 +210,74 @@ async def cloud_status():
             "error": str(e)
         }
 
+# Load shared data once per worker before the first request
+@app.on_event("startup")
+async def preload_question_bank():
+    """Load the question bank so the first interview does not pay for it; the selection index is built on first use"""
+    try:
+        from services.question_bank import get_question_bank
+        get_question_bank()
+    except Exception as e:
+        logger.error(f"Error loading question bank: {e}")
+
+async def sweep_idle_sessions(interval):
+    """Evict idle cached sessions (writing back dirty ones) even when no requests arrive"""
+    try:
+        from routers.interview import active_sessions
+    except ImportError:
+        # Without the interview router there is no session cache to sweep
+        return
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Write-backs touch the session store, so keep them off the event loop
+            await loop.run_in_executor(None, active_sessions.evict_expired)
+        except Exception as e:
+            logger.error(f"Error sweeping idle sessions: {e}")
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    """Start the periodic idle-session sweep"""
+    interval = getattr(settings, "SESSION_CACHE_SWEEP_INTERVAL", 60)
+    if getattr(settings, "SESSION_CACHE_IDLE_TTL", 0) and interval > 0:
+        app.state.session_sweeper = asyncio.create_task(sweep_idle_sessions(interval))
+
+# Release worker threads on shutdown
+@app.on_event("shutdown")
+async def shutdown_executors():
+    """Stop background executors and flush the session store"""
+    sweeper = getattr(app.state, "session_sweeper", None)
+    if sweeper is not None:
+        sweeper.cancel()
+    
+    try:
+        from utils.async_executor import llm_executor, tts_executor
+        llm_executor.shutdown(wait=False)
+        tts_executor.shutdown(wait=False)
+    except Exception as e:
+        logger.error(f"Error shutting down executors: {e}")
+    
+    try:
+        from services.cv_jobs import cv_jobs
+        from services.cv_extract import cv_extractor
+        cv_jobs.shutdown(wait=False)
+        cv_extractor.shutdown(wait=False)
+    except Exception as e:
+        logger.error(f"Error shutting down CV processing: {e}")
+    
+    # Write back cached sessions and flush batched session writes
+    try:
+        from services.session_store import session_store
+        try:
+            from routers.interview import active_sessions
+            active_sessions.flush()
+        except ImportError:
+            pass
+        session_store.close()
+    except Exception as e:
+        logger.error(f"Error closing session store: {e}")
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
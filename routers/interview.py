@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Depends, Response
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Depends, Response, Header, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import io
+import asyncio
 import os
 import time
 import logging
@@ -12,6 +13,23 @@ from google.cloud import texttospeech
 
 # Import the GoogleCloudManager
 from utils.google_cloud import cloud_manager
+from utils.async_executor import llm_executor, tts_executor, generate_content_async
+from utils.voice_catalog import voice_catalog
+from utils.audio_cache import audio_cache
+from utils.llm_cache import llm_cache
+from utils.single_flight import llm_flight, tts_flight
+from services.session_store import session_store
+from utils.ids import new_session_id
+from utils.session_paths import session_dir
+from utils.uploads import save_upload, safe_filename, UploadTooLarge
+from services.cv_store import cv_store
+from services.cv_service import cached_cv_questions
+from services.cv_jobs import cv_jobs, CV_STATUS_PENDING, CV_STATUS_READY
+from utils.session_cache import SessionCache
+from services.tts_service import synthesize_question_audio, split_text_into_chunks, synthesize_chunks_in_order
+from services.question_bank import PREDEFINED_QUESTIONS
+from services.sentiment_service import score_sentiment, summarize_sentiments
+from config import settings
 
 from db.database import get_db
 from models.interview import TextToSpeechRequest
@@ -26,8 +44,18 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Storage for active sessions
-active_sessions = {}
+def _write_back_session(session_id: str, session: dict, dirty: bool):
+    """Snapshot sessions with logged changes as they leave the cache"""
+    if dirty:
+        session_store.save(session)
+    session_store.release(session_id)
+
+# Bounded cache of active sessions
+active_sessions = SessionCache(
+    max_entries=settings.SESSION_CACHE_MAX_ENTRIES,
+    idle_ttl=settings.SESSION_CACHE_IDLE_TTL,
+    on_evict=_write_back_session
+)
 
 # Session directory
 SESSIONS_DIR = os.getenv("SESSIONS_DIR", "sessions")
@@ -51,27 +79,68 @@ class FeedbackRequest(BaseModel):
 
 # Helper functions
 def load_session(session_id: str) -> dict:
-    """Load a session from disk or memory"""
-    if session_id in active_sessions:
-        return active_sessions[session_id]
-        
-    session_file = os.path.join(SESSIONS_DIR, session_id, "session.json")
-    if os.path.exists(session_file):
-        with open(session_file, "r") as f:
-            session = json.load(f)
-            active_sessions[session_id] = session
+    """Load a session from memory or the session store"""
+    # Shared stores can be written by other workers, so always read through
+    if not session_store.shared:
+        session = active_sessions.get(session_id)
+        if session is not None:
             return session
     
+    session = session_store.load(session_id)
+    if session is not None:
+        if not session_store.shared:
+            active_sessions[session_id] = session
+        return session
+    
     raise HTTPException(status_code=404, detail="Session not found")
     
 def save_session(session: dict):
-    """Save a session to disk"""
-    session_id = session["session_id"]
-    session_dir = os.path.join(SESSIONS_DIR, session_id)
-    os.makedirs(session_dir, exist_ok=True)
-    
-    with open(os.path.join(session_dir, "session.json"), "w") as f:
-        json.dump(session, f)
+    """Write a full snapshot of a session to the session store"""
+    session_store.save(session)
+
+def append_session_event(session: dict, field: str, value):
+    """Append a value to a list field of a session and log it"""
+    session.setdefault(field, []).append(value)
+    session_store.append(session, "append", field, value)
+    active_sessions.mark_dirty(session["session_id"])
+
+def set_session_field(session: dict, field: str, value):
+    """Set a field of a session and log it"""
+    session[field] = value
+    session_store.append(session, "set", field, value)
+    active_sessions.mark_dirty(session["session_id"])
+
+def record_cv_status(session_id: str, status: str, questions=None, error=None):
+    """Store progress of a session's background CV job on the session"""
+    try:
+        session = load_session(session_id)
+    except HTTPException:
+        # Session was deleted while its CV was processing
+        return
+    if questions is not None:
+        set_session_field(session, "cv_questions", questions)
+    if error is not None:
+        set_session_field(session, "cv_error", error)
+    if session.get("cv_status") != status:
+        set_session_field(session, "cv_status", status)
+
+def _cv_status_recorder(session_id: str):
+    """
+    on_update callback for cv_jobs. Jobs report from worker threads, so the
+    update is handed to the event loop, where every other session change runs.
+    """
+    loop = asyncio.get_running_loop()
+    def on_update(status, questions, error):
+        loop.call_soon_threadsafe(record_cv_status, session_id, status, questions, error)
+    return on_update
+
+def next_cv_question(session: dict, previous_questions: List[str]) -> Optional[str]:
+    """First ready CV question that has not been asked yet"""
+    asked = set(previous_questions) | set(session.get("questions", []))
+    for question in session.get("cv_questions") or []:
+        if question not in asked:
+            return question
+    return None
 
 # Function to add compatibility routes
 def add_compatibility_routes(app):
@@ -93,40 +162,56 @@ async def create_interview_session(
 ):
     """Create a new interview session"""
     try:
-        # Generate session ID
-        session_id = f"session_{int(time.time())}"
-    
-    # Process CV if provided
+        # Generate a unique, time-ordered session ID
+        session_id = new_session_id()
+        
+        # Process CV if provided
         cv_path = None
-    if cv_file:
-            # Create uploads directory
-            os.makedirs("uploads", exist_ok=True)
-            
-            # Save the file
-        file_content = await cv_file.read()
-            filename = f"{session_id}_{cv_file.filename}"
-            cv_path = os.path.join("uploads", filename)
-            
-            with open(cv_path, "wb") as f:
-                f.write(file_content)
-    
-    # Create session
+        cv_sha256 = None
+        if cv_file:
+            # Stream the file to disk in chunks instead of reading it into memory
+            filename = safe_filename(cv_file.filename, 'cv')
+            try:
+                saved = await save_upload(cv_file, cv_store.incoming_dir, f"{session_id}_{filename}")
+            except UploadTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            # Stored once per content hash; a re-uploaded CV reuses its extraction results
+            cv_path, _ = cv_store.adopt(saved.path, saved.sha256, filename)
+            cv_sha256 = saved.sha256
+        
+        # Create session
         session = {
             "session_id": session_id,
             "cv_path": cv_path,
+            "cv_sha256": cv_sha256,
             "created_at": time.time(),
             "questions": [],
             "responses": []
         }
+        if cv_path:
+            # A CV seen before already has its questions; otherwise they are generated in the background
+            cv_questions = cached_cv_questions(cv_sha256)
+            session["cv_questions"] = cv_questions or []
+            session["cv_status"] = CV_STATUS_READY if cv_questions else CV_STATUS_PENDING
         
         # Save session
-        active_sessions[session_id] = session
-        save_session(session)
-    
-    return {
+        session_store.create(session)
+        if not session_store.shared:
+            active_sessions[session_id] = session
+        
+        if cv_path and session["cv_status"] != CV_STATUS_READY:
+            cv_jobs.submit(
+                session_id, cv_path, cv_sha256,
+                on_update=_cv_status_recorder(session_id)
+            )
+        
+        return {
             "session_id": session_id,
-            "has_cv": cv_path is not None
-    }
+            "has_cv": cv_path is not None,
+            "cv_status": session.get("cv_status")
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error creating session: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
@@ -135,23 +220,56 @@ async def create_interview_session(
 async def list_interview_sessions():
     """List all active interview sessions"""
     try:
-        # Get sessions from disk
-        sessions = []
-        if os.path.exists(SESSIONS_DIR):
-            for session_id in os.listdir(SESSIONS_DIR):
-                session_file = os.path.join(SESSIONS_DIR, session_id, "session.json")
-                if os.path.exists(session_file):
-                    sessions.append(session_id)
-                    # Load into memory if not already there
-                    if session_id not in active_sessions:
-                        with open(session_file, "r") as f:
-                            active_sessions[session_id] = json.load(f)
-        
-        return sessions
+        # Served from the session index; use /sessions/page for large deployments
+        return session_store.list_ids()
     except Exception as e:
         logging.error(f"Error listing sessions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to list sessions: {str(e)}")
 
+@router.get("/sessions/page", response_model=dict)
+async def list_interview_sessions_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    has_cv: Optional[bool] = None,
+    has_feedback: Optional[bool] = None,
+    min_responses: Optional[int] = Query(None, ge=0),
+    created_after: Optional[float] = None,
+    created_before: Optional[float] = None
+):
+    """List session summaries a page at a time, with optional filters"""
+    try:
+        sessions, next_cursor = session_store.query(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            descending=order == "desc",
+            has_cv=has_cv,
+            has_feedback=has_feedback,
+            min_responses=min_responses,
+            created_after=created_after,
+            created_before=created_before
+        )
+        return {"sessions": sessions, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error listing sessions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to list sessions: {str(e)}")
+
+@router.get("/sessions/{session_id}/cv", response_model=dict)
+async def get_cv_status(session_id: str):
+    """Get the progress of CV question generation for a session"""
+    session = load_session(session_id)
+    return {
+        "session_id": session_id,
+        "has_cv": bool(session.get("cv_path")),
+        "status": session.get("cv_status"),
+        "questions_ready": len(session.get("cv_questions") or []),
+        "error": session.get("cv_error")
+    }
+
 @router.post("/questions", response_model=dict)
 async def get_next_question(request: QuestionRequest):
     """Get the next question for an interview session"""
@@ -159,8 +277,11 @@ async def get_next_question(request: QuestionRequest):
         # Load session
         session = load_session(request.session_id)
         
+        # CV questions are used as soon as the background job has produced them
+        question = next_cv_question(session, request.previous_questions)
+        
         # Get the next question using cloud_manager
-        if cloud_manager and hasattr(cloud_manager, 'genai_client'):
+        if not question and cloud_manager and hasattr(cloud_manager, 'genai_client'):
             try:
                 # Use Google AI to get next question
                 prompt = f"""
@@ -173,16 +294,16 @@ async def get_next_question(request: QuestionRequest):
                 try:
                     # Get the Gemini model
                     if hasattr(cloud_manager.genai_client, 'GenerativeModel'):
-                        model = cloud_manager.genai_client.GenerativeModel('gemini-1.5-pro')
-                        response = model.generate_content(prompt)
+                        model = cloud_manager.get_genai_model('gemini-1.5-pro')
+                        response = await generate_content_async(model, prompt)
                         question = response.text
                     else:
                         # Fallback to legacy models if available
                         if hasattr(cloud_manager.genai_client, 'models'):
-                            models = list(cloud_manager.genai_client.list_models())
+                            models = await llm_executor.run(lambda: list(cloud_manager.genai_client.list_models()))
                             model = models[0] if models else None
                             if model and hasattr(model, 'generate_text'):
-                                response = model.generate_text(prompt)
+                                response = await llm_executor.run(model.generate_text, prompt)
                                 question = response.text
                             else:
                                 # Use predefined questions as fallback
@@ -196,13 +317,7 @@ async def get_next_question(request: QuestionRequest):
             except Exception as e:
                 logging.error(f"Failed to use Gemini API: {e}")
                 # Fallback to predefined questions
-                predefined_questions = [
-                    "Can you tell me about your business model?",
-                    "What is your target market?",
-                    "How do you plan to scale your business?",
-                    "What are your competitive advantages?",
-                    "How do you plan to use the funds you're seeking?"
-                ]
+                predefined_questions = PREDEFINED_QUESTIONS
                 
                 # Get next question based on what's been asked
                 asked_questions = set(request.previous_questions)
@@ -216,75 +331,52 @@ async def get_next_question(request: QuestionRequest):
                     }
                     
                 question = available_questions[0]
-        else:
+        elif not question:
             # Fallback to predefined questions
-            predefined_questions = [
-                "Can you tell me about your business model?",
-                "What is your target market?",
-                "How do you plan to scale your business?",
-                "What are your competitive advantages?",
-                "How do you plan to use the funds you're seeking?"
-            ]
+            predefined_questions = PREDEFINED_QUESTIONS
             
             # Get next question based on what's been asked
             asked_questions = set(request.previous_questions)
             available_questions = [q for q in predefined_questions if q not in asked_questions]
             
             if not available_questions:
-        return {
-            "session_id": request.session_id,
-            "question": None,
-            "interview_complete": True
-        }
-    
+                return {
+                    "session_id": request.session_id,
+                    "question": None,
+                    "interview_complete": True
+                }
+            
             question = available_questions[0]
         
         # Add to session
-        session["questions"].append(question)
-        save_session(session)
+        append_session_event(session, "questions", question)
         
         # Generate audio if possible
         audio_data = None
         if cloud_manager and hasattr(cloud_manager, 'tts_client'):
             try:
-                from google.cloud import texttospeech
-                text_input = texttospeech.SynthesisInput(text=question)
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code="en-US",
-                    ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
-                )
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MP3
-                )
-                response = cloud_manager.tts_client.synthesize_speech(
-                    input=text_input,
-                    voice=voice,
-                    audio_config=audio_config
-                )
-                audio_data = response.audio_content
-                
-                # Save the audio file
-                audio_path = os.path.join(SESSIONS_DIR, request.session_id, f"question_{len(session['questions'])-1}.mp3")
-                os.makedirs(os.path.dirname(audio_path), exist_ok=True)
-                with open(audio_path, "wb") as f:
-                    f.write(audio_data)
+                # Repeated questions are served from the audio cache; lookups, synthesis
+                # and the file write all run on the TTS executor
+                audio_path = os.path.join(session_dir(SESSIONS_DIR, request.session_id), f"question_{len(session['questions'])-1}.mp3")
+                audio_data = await tts_executor.run(_save_question_audio, cloud_manager.tts_client, question, audio_path)
             except Exception as e:
                 logging.error(f"Error generating audio: {str(e)}")
-    
-    return {
-        "session_id": request.session_id,
-        "question": question,
+        
+        return {
+            "session_id": request.session_id,
+            "question": question,
             "question_id": str(len(session["questions"]) - 1),
             "has_audio": audio_data is not None,
-        "interview_complete": False
-    }
+            "interview_complete": False
+        }
     except Exception as e:
         logging.error(f"Error getting question: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get question: {str(e)}")
 
 @router.post("/responses", response_model=dict)
 async def submit_response(
-    body: dict
+    body: dict,
+    background_tasks: BackgroundTasks
 ):
     """Submit a response to an interview question"""
     try:
@@ -307,50 +399,23 @@ async def submit_response(
             raise HTTPException(status_code=400, detail="No text response provided")
             
         # Save response
-    response_data = {
-        "question_id": question_id,
+        response_data = {
+            "question_id": question_id,
             "text": text,
             "audio_path": None,
             "timestamp": time.time()
         }
         
+        # Score sentiment locally; it is instant, so the response is not held up
+        sentiment = score_sentiment(text)
+        response_data["sentiment"] = sentiment
+        
         # Add to session
-        if "responses" not in session:
-            session["responses"] = []
-        session["responses"].append(response_data)
-        save_session(session)
+        append_session_event(session, "responses", response_data)
         
-        # Analyze sentiment if possible
-        sentiment = None
-        if cloud_manager and hasattr(cloud_manager, 'genai_client'):
-            try:
-                prompt = f"Analyze the sentiment of this text and provide a score between -1 (negative) and 1 (positive): {text}"
-                
-                # Try to use the appropriate method for the current API version
-                if hasattr(cloud_manager.genai_client, 'GenerativeModel'):
-                    try:
-                        model = cloud_manager.genai_client.GenerativeModel('gemini-1.5-pro')
-                        response = model.generate_content(prompt)
-                        sentiment_text = response.text
-                        
-                        # Try to extract a numeric score
-                        import re
-                        match = re.search(r'(-?\d+(\.\d+)?)', sentiment_text)
-                        if match:
-                            score = float(match.group(1))
-                            sentiment = {"score": score, "explanation": sentiment_text}
-                        else:
-                            sentiment = {"score": 0, "explanation": sentiment_text}
-                    except Exception as e:
-                        logging.error(f"Error using GenerativeModel: {e}")
-                        sentiment = {"score": 0.5, "explanation": "The response appears balanced and informative."}
-                else:
-                    sentiment = {"score": 0.5, "explanation": "The response appears balanced and informative."}
-            except Exception as e:
-                logging.error(f"Error analyzing sentiment: {str(e)}")
-                sentiment = {"score": 0, "explanation": "Sentiment analysis unavailable"}
-        else:
-            sentiment = {"score": 0.5, "explanation": "The response appears balanced and informative."}
+        # Deeper Gemini analysis is attached to the session once it is ready
+        if settings.SENTIMENT_GEMINI_ENRICHMENT and cloud_manager and hasattr(cloud_manager, 'genai_client'):
+            background_tasks.add_task(enrich_sentiment, session_id, question_id, text)
         
         return {
             "session_id": session_id,
@@ -362,6 +427,27 @@ async def submit_response(
         logging.error(f"Error submitting response: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to submit response: {str(e)}")
 
+async def enrich_sentiment(session_id: str, question_id: str, text: str):
+    """Run the Gemini sentiment analysis for an answer and log it on the session"""
+    from utils.gemini_utils import analyze_sentiment_with_gemini
+    
+    started = time.time()
+    try:
+        analysis = await llm_executor.run(analyze_sentiment_with_gemini, text)
+        session = load_session(session_id)
+    except HTTPException:
+        # Session was deleted before the analysis finished
+        return
+    except Exception as e:
+        logger.error(f"Sentiment enrichment failed for session {session_id}: {str(e)}")
+        return
+    append_session_event(session, "sentiment_analyses", {
+        "question_id": question_id,
+        "analysis": analysis,
+        "elapsed_s": round(time.time() - started, 3),
+        "timestamp": time.time()
+    })
+
 @router.post("/feedback", response_model=dict)
 async def generate_feedback(request: FeedbackRequest):
     """Generate feedback for an interview session"""
@@ -375,16 +461,12 @@ async def generate_feedback(request: FeedbackRequest):
         if not session.get("responses"):
             # For demo purposes, add a sample response if needed
             if "questions" in session and len(session["questions"]) > 0:
-                if "responses" not in session:
-                    session["responses"] = []
-                    
                 # Add a placeholder response for testing
-                session["responses"].append({
+                append_session_event(session, "responses", {
                     "question_id": "0",
                     "text": "This is a placeholder response to enable feedback generation for testing.",
                     "timestamp": time.time()
                 })
-                save_session(session)
                 logging.info("Added placeholder response for testing")
             else:
                 raise HTTPException(status_code=400, detail="No responses to analyze")
@@ -420,12 +502,19 @@ async def generate_feedback(request: FeedbackRequest):
                 # Try to use the appropriate method for the current API version
                 if hasattr(cloud_manager.genai_client, 'GenerativeModel'):
                     try:
-                        model = cloud_manager.genai_client.GenerativeModel('gemini-1.5-pro')
-                        response = model.generate_content(prompt)
-                        if hasattr(response, 'text'):
-                            feedback = response.text
-                        else:
-                            feedback = str(response)
+                        model = cloud_manager.get_genai_model('gemini-1.5-pro')
+                        
+                        def generate_feedback_text():
+                            response = model.generate_content(prompt)
+                            if hasattr(response, 'text'):
+                                return response.text
+                            return str(response)
+                        
+                        # A retried or double-fired request for the same transcript gets the same feedback
+                        cache_key = llm_cache.make_key('gemini-1.5-pro', None, prompt)
+                        feedback = await llm_flight.do_async(
+                            cache_key, llm_executor.run, llm_cache.call, cache_key, generate_feedback_text
+                        )
                     except Exception as e:
                         logging.error(f"Error using GenerativeModel: {e}")
                         feedback = get_default_feedback()
@@ -438,13 +527,16 @@ async def generate_feedback(request: FeedbackRequest):
             feedback = get_default_feedback()
         
         # Save feedback to session
-        session["feedback"] = feedback
-        save_session(session)
+        set_session_field(session, "feedback", feedback)
+        
+        # All answers are scored together in one local batch
+        answers = [r.get("text", "") for r in session.get("responses", [])]
         
         return {
             "session_id": request.session_id,
             "summary": feedback,
-            "detailed_feedback": feedback if request.detailed else None
+            "detailed_feedback": feedback if request.detailed else None,
+            "sentiment": summarize_sentiments(answers)
         }
     except Exception as e:
         logging.error(f"Error generating feedback: {str(e)}")
@@ -476,8 +568,91 @@ Your pitch is compelling but would benefit from more concrete examples of tracti
 You demonstrate good knowledge of your business fundamentals. Continue to deepen your market analysis and financial projections to strengthen your overall presentation.
     """
 
+def sse_event(event: str, data: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/feedback/stream", response_class=StreamingResponse)
+async def stream_feedback(request: FeedbackRequest):
+    """
+    Generate feedback for an interview session as server-sent events.
+    A "section" event is sent for each answer as soon as its analysis
+    finishes, then the overall summary arrives as "summary" events while
+    Gemini streams it, and a final "done" event carries the whole summary.
+    """
+    from services.analysis_service import iter_response_analyses, stream_summary, ANALYSIS_UNAVAILABLE, SUMMARY_UNAVAILABLE
+    from services.question_bank import get_question_bank
+    
+    session = load_session(request.session_id)
+    responses = session.get("responses") or []
+    if not responses:
+        raise HTTPException(status_code=400, detail="No responses to analyze")
+    
+    questions = session.get("questions", [])[:len(responses)]
+    answers = [r.get("text", "") for r in responses[:len(questions)]]
+    bank = get_question_bank()
+    expected = [bank.expected_for(q) or "" for q in questions]
+    gemini_available = bool(cloud_manager and getattr(cloud_manager, 'genai_client', None) is not None)
+    
+    async def event_stream():
+        started = time.time()
+        yield sse_event("start", {"session_id": request.session_id, "questions": len(questions)})
+        # Local and instant, so it arrives before any Gemini output
+        yield sse_event("sentiment", summarize_sentiments(answers))
+        
+        if not gemini_available:
+            summary = get_default_feedback()
+            yield sse_event("summary", {"text": summary})
+            set_session_field(session, "feedback", summary)
+            yield sse_event("done", {"summary": summary, "failed": 0, "elapsed_s": round(time.time() - started, 3)})
+            return
+        
+        sections = []
+        async for section in iter_response_analyses(answers, expected, questions):
+            sections.append(section)
+            yield sse_event("section", section)
+        sections.sort(key=lambda section: section["index"])
+        failed = sum(1 for section in sections if section["status"] != "ok")
+        
+        parts = []
+        if sections and failed == len(sections):
+            parts.append(ANALYSIS_UNAVAILABLE)
+            yield sse_event("summary", {"text": ANALYSIS_UNAVAILABLE})
+        else:
+            try:
+                async for text in stream_summary(sections):
+                    parts.append(text)
+                    yield sse_event("summary", {"text": text})
+            except asyncio.TimeoutError:
+                logger.error(f"Feedback summary streaming timed out after {settings.ANALYSIS_CALL_TIMEOUT}s")
+                yield sse_event("error", {"detail": "Summary generation timed out"})
+                if not parts:
+                    parts.append(SUMMARY_UNAVAILABLE)
+            except Exception as e:
+                # Headers are already sent, so report the failure in the stream
+                logger.error(f"Feedback summary streaming error: {str(e)}")
+                yield sse_event("error", {"detail": f"Summary generation failed: {str(e)}"})
+                if not parts:
+                    parts.append(SUMMARY_UNAVAILABLE)
+        
+        summary = "".join(parts)
+        set_session_field(session, "feedback", summary)
+        yield sse_event("done", {"summary": summary, "failed": failed, "elapsed_s": round(time.time() - started, 3)})
+    
+    headers = {
+        "Cache-Control": "no-cache",
+        # Stop proxies and GZip from buffering the stream
+        "X-Accel-Buffering": "no",
+        "Content-Encoding": "identity"
+    }
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
+
 @router.post("/tts", response_class=StreamingResponse)
-async def text_to_speech(request: TextToSpeechRequest, db: Session = Depends(get_db)):
+async def text_to_speech(
+    request: TextToSpeechRequest,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Convert text to speech using Google Cloud Text-to-Speech.
     Returns audio file with voice information in headers.
@@ -495,77 +670,14 @@ async def text_to_speech(request: TextToSpeechRequest, db: Session = Depends(get
     
     try:
         # Select the best available voice
-        voice_name = _get_best_available_voice(client)
+        voice_name = await _get_best_available_voice(client)
         
         # Determine voice type (Chirp HD, Studio, Neural2, etc.)
-        voice_type = "Standard"
-        if "Chirp3-HD" in voice_name:
-            voice_type = "Chirp 3 HD"
-        elif "Studio" in voice_name:
-            voice_type = "Studio"
-        elif "Neural2" in voice_name:
-            voice_type = "Neural2"
-        elif "Wavenet" in voice_name:
-            voice_type = "Wavenet"
-            
-        # Configure the voice
-        voice = texttospeech.VoiceSelectionParams(
-            name=voice_name,
-            language_code="en-US",
-        )
-        
-        # Configure audio settings
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=request.speed,
-            pitch=request.pitch,
-            volume_gain_db=1.0  # Slightly louder
-        )
-        
-        # Prepare the synthesis input
-        # Use SSML for Chirp HD and Studio voices for better quality
-        try:
-            if "Chirp" in voice_name or "Studio" in voice_name:
-                ssml = f"""
-                <speak>
-                  <prosody rate="{request.speed}" pitch="{request.pitch}%" volume="loud">
-                    {request.text}
-                  </prosody>
-                </speak>
-                """
-                synthesis_input = texttospeech.SynthesisInput(ssml=ssml)
-                
-                # Generate the speech
-                logger.info(f"Generating speech with voice: {voice_name} (using SSML)")
-                response = client.synthesize_speech(
-                    input=synthesis_input,
-                    voice=voice,
-                    audio_config=audio_config
-                )
-            else:
-                synthesis_input = texttospeech.SynthesisInput(text=request.text)
-                
-                # Generate the speech
-                logger.info(f"Generating speech with voice: {voice_name} (using plain text)")
-                response = client.synthesize_speech(
-                    input=synthesis_input,
-                    voice=voice,
-                    audio_config=audio_config
-                )
-        except Exception as e:
-            # Fall back to plain text if SSML fails
-            logger.warning(f"SSML synthesis failed: {e}. Trying with plain text.")
-            synthesis_input = texttospeech.SynthesisInput(text=request.text)
+        voice_type = _get_voice_type(voice_name)
             
-            # Generate the speech
-            logger.info(f"Generating speech with voice: {voice_name} (fallback to plain text)")
-            response = client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
-        
-        # Create response headers with voice information
+        # Identical synthesis requests share a content-addressed cache entry
+        cache_key = audio_cache.make_key(request.text, voice_name, request.speed, request.pitch, "MP3")
+        etag = f'"{cache_key}"'
         headers = {
             "Content-Type": "audio/mpeg",
             "X-Voice-Used": voice_name,
@@ -573,6 +685,30 @@ async def text_to_speech(request: TextToSpeechRequest, db: Session = Depends(get
             "Access-Control-Expose-Headers": "X-Voice-Used, X-Voice-Type",
             "Cache-Control": "no-cache"
         }
+        if audio_cache.enabled:
+            headers["ETag"] = etag
+            headers["Cache-Control"] = f"private, max-age={settings.CACHE_TTL}"
+        
+        # The client already has this audio
+        if audio_cache.enabled and if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers={k: v for k, v in headers.items() if k != "Content-Type"})
+        
+        audio_content = await tts_executor.run(audio_cache.get, cache_key)
+        if audio_content is not None:
+            logger.info(f"Serving cached speech for voice: {voice_name}")
+            return StreamingResponse(
+                iter([audio_content]),
+                media_type="audio/mpeg",
+                headers=headers
+            )
+        
+        # Generate the speech off the event loop, joining an identical request in flight
+        audio_content = await tts_flight.do_async(
+            cache_key, tts_executor.run,
+            _synthesize_speech, client, request.text, voice_name, request.speed, request.pitch
+        )
+        
+        await tts_executor.run(audio_cache.put, cache_key, audio_content)
         
         # Log usage if session_id is provided
         if hasattr(request, 'session_id') and request.session_id:
@@ -582,8 +718,8 @@ async def text_to_speech(request: TextToSpeechRequest, db: Session = Depends(get
         process_time = time.time() - start_time
         logger.info(f"TTS processing completed in {process_time:.2f} seconds")
         
-    return StreamingResponse(
-            iter([response.audio_content]), 
+        return StreamingResponse(
+            iter([audio_content]), 
             media_type="audio/mpeg",
             headers=headers
         )
@@ -593,7 +729,78 @@ async def text_to_speech(request: TextToSpeechRequest, db: Session = Depends(get
         raise HTTPException(
             status_code=500,
             detail=f"Failed to convert text to speech: {str(e)}"
-    )
+        )
+
+@router.post("/tts/stream", response_class=StreamingResponse)
+async def text_to_speech_stream(request: TextToSpeechRequest, db: Session = Depends(get_db)):
+    """
+    Convert text to speech, streaming audio sentence by sentence.
+    Chunks are synthesized concurrently and sent in order as soon as each is ready;
+    the time until the first chunk was ready is reported in X-Time-To-First-Byte.
+    """
+    start_time = time.time()
+    
+    client = get_tts_client()
+    if not client:
+        raise HTTPException(
+            status_code=503, 
+            detail="Text-to-Speech service unavailable"
+        )
+    
+    chunks = split_text_into_chunks(request.text)
+    if not chunks:
+        raise HTTPException(status_code=400, detail="No text to synthesize")
+    
+    try:
+        voice_name = await _get_best_available_voice(client)
+        voice_type = _get_voice_type(voice_name)
+        
+        def synthesize_chunk(chunk):
+            # Runs on the TTS executor; sentences repeated across requests hit the audio cache
+            cache_key = audio_cache.make_key(chunk, voice_name, request.speed, request.pitch, "MP3")
+            audio = audio_cache.get(cache_key)
+            if audio is None:
+                audio = tts_flight.do(cache_key, _synthesize_speech, client, chunk, voice_name, request.speed, request.pitch)
+                audio_cache.put(cache_key, audio)
+            return audio
+        
+        audio_stream = synthesize_chunks_in_order(synthesize_chunk, chunks)
+        
+        # Wait for the first chunk so the headers can report time to first byte
+        first_chunk = await audio_stream.__anext__()
+        ttfb = time.time() - start_time
+        logger.info(f"TTS stream first chunk ready in {ttfb:.2f} seconds ({len(chunks)} chunks)")
+    except Exception as e:
+        logger.error(f"Text-to-speech streaming error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to convert text to speech: {str(e)}"
+        )
+    
+    if hasattr(request, 'session_id') and request.session_id:
+        _log_tts_usage(db, request.session_id, request.text, voice_name)
+    
+    async def audio_body():
+        yield first_chunk
+        try:
+            async for audio in audio_stream:
+                yield audio
+        except Exception as e:
+            # Headers are already sent, so the stream just ends early
+            logger.error(f"Text-to-speech streaming error: {str(e)}")
+    
+    headers = {
+        "X-Voice-Used": voice_name,
+        "X-Voice-Type": voice_type,
+        "X-Audio-Chunks": str(len(chunks)),
+        "X-Time-To-First-Byte": f"{ttfb:.3f}",
+        "Server-Timing": f"ttfb;dur={ttfb * 1000:.1f}",
+        "Access-Control-Expose-Headers": "X-Voice-Used, X-Voice-Type, X-Audio-Chunks, X-Time-To-First-Byte, Server-Timing",
+        "Cache-Control": "no-cache",
+        # MP3 does not compress further; this also stops GZip from buffering the stream
+        "Content-Encoding": "identity"
+    }
+    return StreamingResponse(audio_body(), media_type="audio/mpeg", headers=headers)
 
 @router.post("/speech-to-text", response_model=dict)
 async def convert_speech_to_text(
@@ -606,17 +813,17 @@ async def convert_speech_to_text(
             raise HTTPException(status_code=500, detail="Speech-to-text service not available")
             
         # Read audio file
-    audio_data = await audio_file.read()
-    
+        audio_data = await audio_file.read()
+        
         # Save file if session provided
         audio_path = None
-    if session_id:
+        if session_id:
             try:
                 session = load_session(session_id)
-                session_dir = os.path.join(SESSIONS_DIR, session_id)
-                os.makedirs(session_dir, exist_ok=True)
+                audio_dir = session_dir(SESSIONS_DIR, session_id)
+                os.makedirs(audio_dir, exist_ok=True)
                 
-                audio_path = os.path.join(session_dir, f"stt_{int(time.time())}.wav")
+                audio_path = os.path.join(audio_dir, f"stt_{int(time.time())}.wav")
                 with open(audio_path, "wb") as f:
                     f.write(audio_data)
             except Exception as e:
@@ -642,16 +849,11 @@ async def convert_speech_to_text(
         if session_id and audio_path:
             try:
                 session = load_session(session_id)
-                if "stt_history" not in session:
-                    session["stt_history"] = []
-                    
-                session["stt_history"].append({
+                append_session_event(session, "stt_history", {
                     "audio_path": audio_path,
                     "transcript": transcript,
                     "timestamp": time.time()
                 })
-                
-                save_session(session)
             except Exception as e:
                 logging.error(f"Error saving transcript to session: {str(e)}")
         
@@ -668,14 +870,10 @@ async def delete_interview_session(session_id: str):
         load_session(session_id)
         
         # Remove from memory
-        if session_id in active_sessions:
-            del active_sessions[session_id]
+        active_sessions.pop(session_id)
             
-        # Remove from disk
-        session_dir = os.path.join(SESSIONS_DIR, session_id)
-        if os.path.exists(session_dir):
-            import shutil
-            shutil.rmtree(session_dir)
+        # Remove from the store, including the session directory
+        session_store.delete(session_id)
             
         return {
             "session_id": session_id,
@@ -689,79 +887,91 @@ async def delete_interview_session(session_id: str):
 
 # Helper functions for text-to-speech
 def get_tts_client():
-    """Get or initialize the Text-to-Speech client."""
+    """Get the shared Text-to-Speech client held by the cloud manager."""
     try:
-        from google.cloud import texttospeech
-        client = texttospeech.TextToSpeechClient()
-        return client
+        return cloud_manager.get_tts_client()
     except Exception as e:
         logger.error(f"Failed to initialize Text-to-Speech client: {str(e)}")
         return None
 
-def _get_best_available_voice(client):
-    """Find the best available voice from Google Cloud TTS."""
+async def _get_best_available_voice(client, language_code="en-US"):
+    """Find the best available voice from Google Cloud TTS, using the cached voice catalogue.
+    Only a cold catalogue calls list_voices, on the TTS executor rather than the event loop."""
+    if voice_catalog.has_voice(language_code):
+        return voice_catalog.get_best_voice(client, language_code)
+    return await tts_executor.run(voice_catalog.get_best_voice, client, language_code)
+
+def _save_question_audio(client, question, audio_path):
+    """Get audio for a question and write it to the session; returns the audio bytes"""
+    audio_data, _ = synthesize_question_audio(client, question)
+    os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+    with open(audio_path, "wb") as f:
+        f.write(audio_data)
+    return audio_data
+
+def _get_voice_type(voice_name):
+    """Describe the voice family (Chirp HD, Studio, Neural2, etc.)"""
+    if "Chirp3-HD" in voice_name:
+        return "Chirp 3 HD"
+    elif "Studio" in voice_name:
+        return "Studio"
+    elif "Neural2" in voice_name:
+        return "Neural2"
+    elif "Wavenet" in voice_name:
+        return "Wavenet"
+    return "Standard"
+
+def _synthesize_speech(client, text, voice_name, speed, pitch):
+    """Synthesize MP3 audio for text with the given voice. Blocking; run it on the TTS executor."""
+    # Configure the voice
+    voice = texttospeech.VoiceSelectionParams(
+        name=voice_name,
+        language_code="en-US",
+    )
+    
+    # Configure audio settings
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3,
+        speaking_rate=speed,
+        pitch=pitch,
+        volume_gain_db=1.0  # Slightly louder
+    )
+    
+    # Prepare the synthesis input
+    # Use SSML for Chirp HD and Studio voices for better quality
     try:
-        # List available voices
-        voices_response = client.list_voices(language_code="en-US")
-        voice_names = [v.name for v in voices_response.voices]
-        
-        # Check for Chirp 3 HD voices first (highest quality)
-        chirp3_hd_voices = [
-            v for v in voice_names if "Chirp3-HD" in v
-        ]
-        
-        # Try to find best Chirp 3 HD voice
-        if chirp3_hd_voices:
-            # Prioritize specific good Chirp voices if available
-            priority_voices = [
-                "en-US-Chirp3-HD-Kore", 
-                "en-US-Chirp3-HD-Leda",
-                "en-US-Chirp3-HD-Aoede",
-                "en-US-Chirp3-HD-Charon",
-                "en-US-Chirp3-HD-Puck",
-                "en-US-Chirp3-HD-Zephyr"
-            ]
-            
-            # Try to find one of the priority voices first
-            for voice in priority_voices:
-                if voice in chirp3_hd_voices:
-                    logger.info(f"Using priority Chirp 3 HD voice: {voice}")
-                    return voice
-            
-            # Otherwise use the first available Chirp 3 HD voice
-            logger.info(f"Using Chirp 3 HD voice: {chirp3_hd_voices[0]}")
-            return chirp3_hd_voices[0]
-        
-        # Check for Studio voices next
-        studio_voices = [v for v in voice_names if "Studio" in v]
-        if studio_voices:
-            logger.info(f"Using Studio voice: {studio_voices[0]}")
-            return studio_voices[0]
-                
-        # Check for Neural2 voices
-        neural_voices = [v for v in voice_names if "Neural2" in v]
-        if neural_voices:
-            logger.info(f"Using Neural2 voice: {neural_voices[0]}")
-            return neural_voices[0]
-                
-        # Try WaveNet voices
-        wavenet_voices = [v for v in voice_names if "Wavenet" in v]
-        if wavenet_voices:
-            logger.info(f"Using WaveNet voice: {wavenet_voices[0]}")
-            return wavenet_voices[0]
-                
-        # Fall back to first available voice
-        if voice_names:
-            logger.info(f"Using standard voice: {voice_names[0]}")
-            return voice_names[0]
-            
-        # If we get here, no voices were found
-        logger.error("No voices available in Google Cloud TTS")
-        return "en-US-Standard-C"  # Default fallback
-            
+        if "Chirp" in voice_name or "Studio" in voice_name:
+            ssml = f"""
+            <speak>
+              <prosody rate="{speed}" pitch="{pitch}%" volume="loud">
+                {text}
+              </prosody>
+            </speak>
+            """
+            synthesis_input = texttospeech.SynthesisInput(ssml=ssml)
+            logger.info(f"Generating speech with voice: {voice_name} (using SSML)")
+        else:
+            synthesis_input = texttospeech.SynthesisInput(text=text)
+            logger.info(f"Generating speech with voice: {voice_name} (using plain text)")
+        
+        response = client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
     except Exception as e:
-        logger.error(f"Error while listing voices: {str(e)}")
-        return "en-US-Standard-C"  # Default fallback
+        # Fall back to plain text if SSML fails
+        logger.warning(f"SSML synthesis failed: {e}. Trying with plain text.")
+        synthesis_input = texttospeech.SynthesisInput(text=text)
+        
+        logger.info(f"Generating speech with voice: {voice_name} (fallback to plain text)")
+        response = client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
+    
+    return response.audio_content
 
 def _log_tts_usage(db, session_id, text, voice):
     """Log TTS usage to database."""
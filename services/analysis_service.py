@@ -1,5 +1,8 @@
 import asyncio
-from utils.gemini_utils import generate_content, generate_feedback_with_examples
+import time
+from utils.gemini_utils import generate_content, stream_content, generate_feedback_with_examples, GENERATION_ERROR_PREFIX
+from utils.async_executor import llm_executor
+from utils.llm_cache import llm_cache
 from config import settings
 import os
 import logging
@@ -9,8 +12,15 @@ from google.generativeai import GenerativeModel
 
 logger = logging.getLogger(__name__)
 
-async def analyze_single_response(question, actual, expected):
-    """Analyze a single interview response using Gemini with improved prompting"""
+ANALYSIS_UNAVAILABLE = "We couldn't analyze the responses at this time. Please try again later."
+SUMMARY_UNAVAILABLE = "The overall summary is not available right now; see the per-question feedback."
+
+async def analyze_single_response(question, actual, expected, timeout=None):
+    """
+    Analyze a single interview response using Gemini with improved prompting.
+    The call runs on the LLM executor; raises asyncio.TimeoutError after
+    timeout seconds and RuntimeError if Gemini returns an error.
+    """
     system_instruction = """
     You are an expert VC investor and pitch coach with extensive experience evaluating founders.
     Your feedback is specific, actionable, and balanced, focusing on both substance and delivery.
@@ -33,26 +43,128 @@ async def analyze_single_response(question, actual, expected):
     Be precise about what worked well and what specific changes would strengthen the response.
     """
     
-    return generate_content(
-        prompt=prompt,
+    return await _generate(prompt, system_instruction, 0.4, timeout)
+
+async def _generate(prompt, system_instruction, temperature, timeout):
+    """generate_content on the LLM executor with a timeout; Gemini errors are raised"""
+    result = await asyncio.wait_for(
+        llm_executor.run(
+            generate_content,
+            prompt=prompt,
+            system_instruction=system_instruction,
+            temperature=temperature
+        ),
+        timeout=timeout
+    )
+    if result.startswith(GENERATION_ERROR_PREFIX):
+        raise RuntimeError(result[len(GENERATION_ERROR_PREFIX):].strip())
+    return result
+
+async def _analyze_section(index, question, actual, expected, semaphore, timeout):
+    """Analyze one answer; failures are recorded on the section instead of raised"""
+    section = {"index": index, "question": question, "status": "ok", "feedback": None, "error": None}
+    async with semaphore:
+        started = time.time()
+        try:
+            section["feedback"] = await analyze_single_response(question, actual, expected, timeout)
+        except asyncio.TimeoutError:
+            section.update(status="failed", error=f"timed out after {timeout}s")
+        except Exception as e:
+            section.update(status="failed", error=str(e))
+        section["elapsed_s"] = round(time.time() - started, 3)
+    if section["error"]:
+        logger.warning(f"Analysis of answer {index + 1} failed: {section['error']}")
+    return section
+
+async def iter_response_analyses(responses, expected, questions, max_concurrency=None, timeout=None):
+    """Yield each answer's analysis section as soon as it finishes"""
+    max_concurrency = max_concurrency or settings.ANALYSIS_MAX_CONCURRENCY
+    timeout = timeout or settings.ANALYSIS_CALL_TIMEOUT
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+    tasks = [
+        asyncio.ensure_future(_analyze_section(i, question, actual, expected_ans, semaphore, timeout))
+        for i, (question, actual, expected_ans) in enumerate(zip(questions, responses, expected))
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def stream_summary(sections, timeout=None):
+    """
+    Yield the overall summary text as Gemini streams it.
+    Raises asyncio.TimeoutError if the whole stream takes longer than timeout seconds.
+    """
+    timeout = timeout or settings.ANALYSIS_CALL_TIMEOUT
+    deadline = time.monotonic() + timeout
+    system_instruction, summary_prompt = _summary_request(sections)
+    stream = llm_executor.iterate(
+        stream_content,
+        prompt=summary_prompt,
         system_instruction=system_instruction,
-        temperature=0.4
+        temperature=0.5
     )
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                text = await asyncio.wait_for(stream.__anext__(), remaining)
+            except StopAsyncIteration:
+                return
+            yield text
+    finally:
+        await stream.aclose()
 
-async def analyze_responses(responses, expected, questions):
-    """Analyze responses concurrently with enhanced methods"""
-    tasks = []
-    for i, (question, actual, expected_ans) in enumerate(zip(questions, responses, expected)):
-        tasks.append(analyze_single_response(question, actual, expected_ans))
-    
-    individual_feedback = await asyncio.gather(*tasks)
+async def analyze_responses(responses, expected, questions, max_concurrency=None, timeout=None):
+    """
+    Analyze responses concurrently with enhanced methods.
+    Per-answer calls run in parallel on the LLM executor, at most
+    max_concurrency at a time, each abandoned after timeout seconds.
+    Answers whose analysis fails are reported in "sections" and left out of
+    the summary, so one slow or failed call does not lose the rest.
+    """
+    timeout = timeout or settings.ANALYSIS_CALL_TIMEOUT
+    sections = [
+        section async for section in
+        iter_response_analyses(responses, expected, questions, max_concurrency, timeout)
+    ]
+    sections.sort(key=lambda section: section["index"])
+    failed = sum(1 for section in sections if section["status"] != "ok")
     
     # Combine individual feedback
-    combined_feedback = ""
-    for i, feedback in enumerate(individual_feedback):
-        combined_feedback += f"\n\n== Question {i+1}: {questions[i]} ==\n{feedback}"
+    combined_feedback = _combine_feedback(sections)
     
-    # Generate overall summary with more specific guidance
+    if sections and failed == len(sections):
+        return {
+            "detailed_feedback": combined_feedback,
+            "summary": ANALYSIS_UNAVAILABLE,
+            "sections": sections,
+            "failed": failed
+        }
+    
+    system_instruction, summary_prompt = _summary_request(sections)
+    try:
+        summary_response = await _generate(summary_prompt, system_instruction, 0.5, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Feedback summary timed out after {timeout}s")
+        summary_response = SUMMARY_UNAVAILABLE
+    except Exception as e:
+        logger.error(f"Feedback summary failed: {e}")
+        summary_response = SUMMARY_UNAVAILABLE
+    
+    return {
+        "detailed_feedback": combined_feedback,
+        "summary": summary_response,
+        "sections": sections,
+        "failed": failed
+    }
+
+def _summary_request(sections):
+    """(system_instruction, prompt) for the overall summary of the successful analyses"""
     system_instruction = """
     You are a senior venture capital partner providing feedback to a founder after a pitch meeting.
     Your assessment is honest but constructive, highlighting specific strengths while providing
@@ -61,7 +173,7 @@ async def analyze_responses(responses, expected, questions):
     
     summary_prompt = f"""
     Based on this detailed VC interview feedback, provide a structured assessment of the candidate's performance:
-    {combined_feedback}
+    {_combine_feedback(sections, include_failed=False)}
     
     Format your feedback as follows:
 
@@ -84,17 +196,16 @@ async def analyze_responses(responses, expected, questions):
     NEXT STEPS:
     [3 concrete action items to improve pitch effectiveness]
     """
-    
-    summary_response = generate_content(
-        prompt=summary_prompt,
-        system_instruction=system_instruction,
-        temperature=0.5
-    )
-    
-    return {
-        "detailed_feedback": combined_feedback,
-        "summary": summary_response
-    }
+    return system_instruction, summary_prompt
+
+def _combine_feedback(sections, include_failed=True):
+    combined_feedback = ""
+    for section in sections:
+        if section["status"] != "ok" and not include_failed:
+            continue
+        feedback = section["feedback"] or f"Feedback unavailable for this answer ({section['error']})."
+        combined_feedback += f"\n\n== Question {section['index'] + 1}: {section['question']} ==\n{feedback}"
+    return combined_feedback
 
 def analyze_sentiment(text):
     """
@@ -215,9 +326,13 @@ def generate_interview_feedback(session):
             "max_output_tokens": 8192,
         }
         
-        response = model.generate_content(prompt, generation_config=generation_config)
+        # Retried requests for the same transcript get the same feedback
+        cache_key = llm_cache.make_key(getattr(model, "model_name", model), None, prompt, generation_config)
+        feedback = llm_cache.call(
+            cache_key, lambda: model.generate_content(prompt, generation_config=generation_config).text
+        )
         
-        return {"feedback": response.text}
+        return {"feedback": feedback}
             
     except Exception as e:
         logger.error(f"Error generating interview feedback: {e}")
@@ -248,11 +363,12 @@ def generate_interview_questions(cv_text=None, previous_questions=None, previous
             Return only the questions as a JSON array of strings.
             """
             
-            response = model.generate_content(prompt)
+            # The prompt never changes, so the standard questions are cached
+            cache_key = llm_cache.make_key(getattr(model, "model_name", model), None, prompt)
+            response_text = llm_cache.call(cache_key, lambda: model.generate_content(prompt).text)
             
             try:
                 # Try to parse response as JSON
-                response_text = response.text
                 if "```json" in response_text:
                     json_text = response_text.split("```json")[1].split("```")[0].strip()
                 elif "```" in response_text:
@@ -0,0 +1,94 @@
+"""
+Pre-render interview question audio into the versioned audio store.
+
+Usage:
+    python -m services.audio_prerender [--workers N] [--csv PATH ...] [--prune] [--dry-run]
+
+Only questions whose audio is missing from the store are synthesized, so the
+job can be re-run whenever the question bank changes.
+"""
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import settings
+from services.question_bank import PREDEFINED_QUESTIONS, load_question_rows
+from services.tts_service import question_audio_key, render_question_audio
+from utils.audio_store import audio_store
+
+logger = logging.getLogger("audio_prerender")
+
+def collect_questions(csv_paths=None):
+    """All question texts that the interview endpoints can serve, without duplicates"""
+    questions = [question for question, _ in load_question_rows(csv_paths)]
+    questions.extend(PREDEFINED_QUESTIONS)
+    return list(dict.fromkeys(questions))
+
+def prerender(client, questions, store=audio_store, workers=None, prune=False, dry_run=False):
+    """Render missing question audio concurrently and publish the store manifest"""
+    workers = workers or settings.PRERENDER_WORKERS
+    wanted = {question_audio_key(q): q for q in questions}
+    existing = store.keys()
+    pending = {key: text for key, text in wanted.items() if not store.has(key)}
+    stale = existing - set(wanted) if prune else set()
+
+    logger.info(
+        f"{len(wanted)} questions, {len(pending)} to render, "
+        f"{len(wanted) - len(pending)} up to date, {len(stale)} stale"
+    )
+    if dry_run:
+        return {"total": len(wanted), "rendered": 0, "failed": 0, "pending": len(pending), "pruned": 0}
+
+    rendered = 0
+    failed = 0
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prerender") as executor:
+        futures = {
+            executor.submit(render_question_audio, client, text): key
+            for key, text in pending.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                store.put(key, pending[key], future.result())
+                rendered += 1
+            except Exception as e:
+                failed += 1
+                logger.error(f"Failed to render '{pending[key][:60]}': {e}")
+
+    for key in stale:
+        store.remove(key)
+
+    store.save_manifest()
+    elapsed = time.time() - start_time
+    logger.info(f"Rendered {rendered} questions ({failed} failed) in {elapsed:.1f}s into {store.directory}")
+    return {"total": len(wanted), "rendered": rendered, "failed": failed, "pending": 0, "pruned": len(stale)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render interview question audio")
+    parser.add_argument("--workers", type=int, default=settings.PRERENDER_WORKERS, help="Concurrent synthesis requests")
+    parser.add_argument("--csv", action="append", dest="csv_paths", help="Question CSV to read (repeatable)")
+    parser.add_argument("--prune", action="store_true", help="Remove audio for questions no longer in the bank")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be rendered")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    client = None
+    if not args.dry_run:
+        from utils.google_cloud import cloud_manager
+        client = cloud_manager.get_tts_client()
+
+    result = prerender(
+        client,
+        collect_questions(args.csv_paths),
+        workers=args.workers,
+        prune=args.prune,
+        dry_run=args.dry_run
+    )
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Bulk CV ingestion: create one interview session per CV.
+
+Usage:
+    python -m services.cv_batch PATH [PATH ...] [--llm-concurrency N] [--no-questions] [--report FILE]
+
+PATH is a directory of CVs or a .zip archive. CVs are stored by content hash
+(duplicates are ingested once), text is extracted on the CV extraction
+process pool, questions are generated with a bounded number of concurrent
+Gemini calls, and all sessions are written to the session store in one
+batch. Per-file timings and overall throughput are reported at the end.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import zipfile
+import argparse
+import tempfile
+
+from config import settings
+from utils.ids import new_session_id
+from utils.uploads import safe_filename
+from services.cv_store import cv_store
+from services.cv_extract import cv_extractor
+from services.cv_service import hash_file, get_cv_text_async, get_cv_questions_async
+from services.cv_jobs import CV_STATUS_READY, CV_STATUS_FAILED
+
+logger = logging.getLogger("cv_batch")
+
+CV_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+
+def collect_cv_files(paths, work_dir, max_bytes=None, max_total_bytes=None):
+    """
+    (path, label) pairs for CVs in directories and zip archives.
+    Archives are unpacked into work_dir; their label is archive.zip:member.
+    Members larger than max_bytes are skipped, and unpacking an archive
+    stops once max_total_bytes have been written.
+    """
+    if max_bytes is None:
+        max_bytes = settings.MAX_UPLOAD_MB * 1024 * 1024
+    if max_total_bytes is None:
+        max_total_bytes = settings.CV_BATCH_MAX_UNPACKED_MB * 1024 * 1024
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.splitext(name)[1].lower() in CV_EXTENSIONS:
+                    files.append((os.path.join(path, name), os.path.join(path, name)))
+        elif os.path.splitext(path)[1].lower() in CV_EXTENSIONS:
+            # Checked before the archive test: a .docx is a zip file too
+            files.append((path, path))
+        elif path.lower().endswith(".zip") and zipfile.is_zipfile(path):
+            files.extend(_unpack_zip(path, work_dir, max_bytes, max_total_bytes))
+        else:
+            logger.warning(f"Skipping {path}: not a CV, directory or zip archive")
+    return files
+
+def _unpack_zip(path, work_dir, max_bytes, max_total_bytes):
+    target_dir = tempfile.mkdtemp(prefix="zip-", dir=work_dir)
+    files = []
+    total = 0
+    with zipfile.ZipFile(path) as archive:
+        for index, info in enumerate(archive.infolist()):
+            if info.is_dir() or os.path.splitext(info.filename)[1].lower() not in CV_EXTENSIONS:
+                continue
+            if info.file_size > max_bytes:
+                logger.warning(f"Skipping {path}:{info.filename}: larger than {max_bytes // (1024 * 1024)} MB")
+                continue
+            if total + info.file_size > max_total_bytes:
+                logger.error(f"Stopped unpacking {path}: more than {max_total_bytes // (1024 * 1024)} MB of CVs")
+                break
+            # Flatten member paths so an archive cannot write outside target_dir
+            target = os.path.join(target_dir, f"{index:05d}_{safe_filename(info.filename)}")
+            # The declared size can lie, so count what is actually decompressed
+            written = _copy_limited(archive, info, target, min(max_bytes, max_total_bytes - total))
+            if written is None:
+                os.remove(target)
+                logger.warning(f"Skipping {path}:{info.filename}: decompresses past its size limit")
+                continue
+            total += written
+            files.append((target, f"{path}:{info.filename}"))
+    return files
+
+def _copy_limited(archive, info, target, limit, chunk_size=1024 * 1024):
+    """Copy an archive member to target; returns the bytes written, or None once limit is passed"""
+    written = 0
+    with archive.open(info) as src, open(target, "wb") as dst:
+        while True:
+            chunk = src.read(min(chunk_size, limit - written + 1))
+            if not chunk:
+                return written
+            written += len(chunk)
+            if written > limit:
+                return None
+            dst.write(chunk)
+
+def _store_cv(path):
+    """Copy a CV into the CV store; returns (stored_path, sha256, is_new)"""
+    sha256 = hash_file(path)
+    existing = cv_store.find(sha256)
+    if existing:
+        return existing, sha256, False
+    os.makedirs(cv_store.incoming_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cv_store.incoming_dir, prefix=".batch-", suffix=".tmp")
+    os.close(fd)
+    shutil.copyfile(path, tmp_path)
+    stored_path, is_new = cv_store.adopt(tmp_path, sha256, safe_filename(os.path.basename(path), "cv"))
+    return stored_path, sha256, is_new
+
+async def _prepare_cv(cv_path, sha256, semaphore, extract_semaphore, generate_questions):
+    """Extract text and generate questions for one stored CV; returns (text, questions, timings)"""
+    timings = {}
+    async with extract_semaphore:
+        t = time.time()
+        text = await get_cv_text_async(cv_path, sha256)
+    timings["extract_s"] = round(time.time() - t, 3)
+    questions = []
+    if text and generate_questions:
+        t = time.time()
+        questions = await get_cv_questions_async(cv_path, sha256, semaphore=semaphore)
+        timings["questions_s"] = round(time.time() - t, 3)
+    return text, questions, timings
+
+async def ingest_cv(path, label, semaphore, extract_semaphore, in_flight, generate_questions=True, max_bytes=None):
+    """
+    Store one CV and prepare its session; returns (session or None, report row).
+    extract_semaphore bounds concurrent extractions, so each one's timeout
+    only starts once it can get a worker.
+    Copies of the same CV within a batch share one extraction and Gemini call
+    through in_flight (sha256 -> task).
+    """
+    started = time.time()
+    row = {"file": label, "status": "ok"}
+    try:
+        size = os.path.getsize(path)
+        row["bytes"] = size
+        if max_bytes and size > max_bytes:
+            raise ValueError(f"larger than {max_bytes // (1024 * 1024)} MB")
+
+        loop = asyncio.get_running_loop()
+        cv_path, sha256, is_new = await loop.run_in_executor(None, _store_cv, path)
+        row.update(sha256=sha256, duplicate=not is_new)
+
+        task = in_flight.get(sha256)
+        if task is None:
+            task = asyncio.ensure_future(_prepare_cv(cv_path, sha256, semaphore, extract_semaphore, generate_questions))
+            in_flight[sha256] = task
+        text, questions, timings = await task
+        row.update(timings)
+        if not text:
+            raise ValueError("no text could be extracted")
+        row["questions"] = len(questions)
+
+        session = {
+            "session_id": new_session_id(),
+            "cv_path": cv_path,
+            "cv_sha256": sha256,
+            "cv_filename": os.path.basename(label),
+            "created_at": time.time(),
+            "questions": [],
+            "responses": [],
+            "cv_questions": questions,
+            "cv_status": CV_STATUS_READY if questions or not generate_questions else CV_STATUS_FAILED,
+            "source": "batch"
+        }
+        row["session_id"] = session["session_id"]
+        return session, row
+    except Exception as e:
+        row.update(status="failed", error=str(e))
+        return None, row
+    finally:
+        row["total_s"] = round(time.time() - started, 3)
+
+async def ingest(paths, store=None, llm_concurrency=None, generate_questions=True, work_dir=None):
+    """Ingest CVs from directories/zips and create their sessions; returns the report dict"""
+    if store is None:
+        from services.session_store import session_store
+        store = session_store
+
+    started = time.time()
+    own_work_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="cv-batch-")
+    try:
+        files = collect_cv_files(paths, work_dir)
+        logger.info(f"Ingesting {len(files)} CVs")
+
+        semaphore = asyncio.Semaphore(llm_concurrency or settings.LLM_MAX_CONCURRENCY)
+        extract_semaphore = asyncio.Semaphore(cv_extractor.max_workers)
+        max_bytes = settings.MAX_UPLOAD_MB * 1024 * 1024
+        in_flight = {}
+        results = await asyncio.gather(*[
+            ingest_cv(path, label, semaphore, extract_semaphore, in_flight, generate_questions, max_bytes) for path, label in files
+        ])
+    finally:
+        if own_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    sessions = [session for session, _ in results if session is not None]
+    rows = [row for _, row in results]
+    t = time.time()
+    if sessions:
+        store.create_many(sessions)
+    write_s = time.time() - t
+
+    elapsed = time.time() - started
+    summary = {
+        "files": len(rows),
+        "sessions_created": len(sessions),
+        "failed": sum(1 for row in rows if row["status"] != "ok"),
+        "duplicates": sum(1 for row in rows if row.get("duplicate")),
+        "elapsed_s": round(elapsed, 3),
+        "session_write_s": round(write_s, 3),
+        "files_per_s": round(len(rows) / elapsed, 2) if elapsed else None
+    }
+    return {"summary": summary, "files": rows}
+
+def print_report(report):
+    for row in report["files"]:
+        if row["status"] == "ok":
+            print(f"{row['total_s']:8.2f}s  extract {row.get('extract_s', 0):6.2f}s  "
+                  f"questions {row.get('questions_s', 0):6.2f}s  {'dup ' if row.get('duplicate') else '    '}"
+                  f"{row['file']} -> {row['session_id']}")
+        else:
+            print(f"{row['total_s']:8.2f}s  FAILED  {row['file']}: {row.get('error')}")
+    summary = report["summary"]
+    print(
+        f"\n{summary['sessions_created']}/{summary['files']} sessions created, "
+        f"{summary['failed']} failed, {summary['duplicates']} duplicates, "
+        f"{summary['elapsed_s']}s ({summary['files_per_s']} files/s, "
+        f"session write {summary['session_write_s']}s)"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create interview sessions from a batch of CVs")
+    parser.add_argument("paths", nargs="+", help="Directories of CVs or zip archives")
+    parser.add_argument("--llm-concurrency", type=int, default=settings.LLM_MAX_CONCURRENCY,
+                        help="Concurrent Gemini calls for question generation")
+    parser.add_argument("--no-questions", action="store_true", help="Only extract text, skip question generation")
+    parser.add_argument("--report", help="Write the per-file report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    try:
+        report = asyncio.run(ingest(
+            args.paths,
+            llm_concurrency=args.llm_concurrency,
+            generate_questions=not args.no_questions
+        ))
+    finally:
+        from services.session_store import session_store
+        cv_extractor.shutdown(wait=True)
+        session_store.close()
+
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["summary"]["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+CV text extraction pipeline.
+
+Parsing runs in a process pool so it never holds the event loop or the GIL
+of the API process. Large PDFs are split into page ranges that are
+extracted in parallel. Workers import this module rather than
+cv_service, so they start without the Gemini and Cloud clients.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2
+import docx
+import fitz  # PyMuPDF for better PDF extraction
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class CVExtractionTimeout(TimeoutError):
+    """Raised when a CV takes longer than the configured timeout to parse"""
+
+def count_pdf_pages(path):
+    try:
+        with fitz.open(path) as pdf:
+            return pdf.page_count
+    except ImportError:
+        with open(path, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+def extract_pdf_pages(path, start, stop):
+    """Text of pages [start, stop) of a PDF, one string per page"""
+    try:
+        with fitz.open(path) as pdf:
+            return [pdf[i].get_text() for i in range(start, min(stop, pdf.page_count))]
+    except ImportError:
+        # Fallback to PyPDF2 if PyMuPDF is not available
+        with open(path, "rb") as f:
+            pages = PyPDF2.PdfReader(f).pages
+            return [pages[i].extract_text() or "" for i in range(start, min(stop, len(pages)))]
+
+def extract_docx_text(path):
+    doc = docx.Document(path)
+    parts = [paragraph.text + "\n" for paragraph in doc.paragraphs]
+    # Also extract text from tables
+    for table in doc.tables:
+        for row in table.rows:
+            parts.append(" ".join(cell.text for cell in row.cells) + " \n")
+    return "".join(parts)
+
+def extract_plain_text(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+def extract_text(path, max_pages=None):
+    """Extract the raw text of a CV in the current process"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        stop = max_pages or count_pdf_pages(path)
+        return "".join(extract_pdf_pages(path, 0, stop))
+    if extension in (".docx", ".doc"):
+        return extract_docx_text(path)
+    return extract_plain_text(path)
+
+class _Task:
+    """One unit of extraction work on the pool and when it started running"""
+
+    __slots__ = ("func", "args", "pool", "future", "started", "attempts")
+
+    def __init__(self, func, args, attempts=1):
+        self.func = func
+        self.args = args
+        self.attempts = attempts
+        self.pool = None
+        self.future = None
+        self.started = None
+
+class CVExtractor:
+    """
+    Extracts CV text on a process pool with a page cap and a timeout.
+    A task is only submitted once a worker is free, so the timeout measures
+    how long it has been running, not how long it waited. When a task
+    times out the pool is restarted to kill it; other documents' tasks that
+    were running on that pool are submitted again on the new one.
+    """
+
+    max_retries = 2  # Resubmissions of a task whose pool was restarted under it
+
+    def __init__(self, max_workers=2, timeout=30, max_pages=50, pages_per_task=8):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.pages_per_task = max(1, int(pages_per_task))
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+        # Counters
+        self.completed = 0
+        self.timeouts = 0
+        self.truncated = 0
+        self.resubmitted = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn: the API process runs threads, which do not mix with fork
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    logger.info(f"Started CV extraction pool with {self.max_workers} workers")
+        return self._pool
+
+    def _start(self, task):
+        """Submit a task; the caller holds a worker slot, which is released when the task finishes"""
+        try:
+            pool = self._get_pool()
+            try:
+                future = pool.submit(task.func, *task.args)
+            except (BrokenProcessPool, RuntimeError):
+                # The pool was restarted between _get_pool and submit
+                self._discard_pool(pool)
+                pool = self._get_pool()
+                future = pool.submit(task.func, *task.args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        task.pool, task.future, task.started = pool, future, time.monotonic()
+        return task
+
+    def _run_all(self, calls, path):
+        """
+        Run (func, args) calls on the pool and return their results in order.
+        Tasks are submitted as workers free up, and the wait for a slot only
+        blocks while none of this document's tasks are running, so a stuck
+        task always reaches its deadline and _on_timeout.
+        """
+        results = [None] * len(calls)
+        pending = deque((index, _Task(func, args)) for index, (func, args) in enumerate(calls))
+        running = {}  # future -> (index, task)
+        while pending or running:
+            while pending and self._slots.acquire(blocking=not running):
+                index, task = pending.popleft()
+                running[self._start(task).future] = (index, task)
+
+            deadline = min(task.started for _, task in running.values()) + self.timeout
+            done, _ = wait_futures(
+                running, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                # Restart every pool still running this document's work; tasks of
+                # other documents on them are resubmitted by their own callers
+                for pool in {task.pool for _, task in running.values()}:
+                    self._on_timeout(pool, path)
+                raise CVExtractionTimeout(f"Extracting {path} took longer than {self.timeout}s")
+
+            for future in done:
+                index, task = running.pop(future)
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    # Another document's timeout restarted the pool; run this task again
+                    if task.attempts > self.max_retries:
+                        raise
+                    self.resubmitted += 1
+                    pending.appendleft((index, _Task(task.func, task.args, task.attempts + 1)))
+        return results
+
+    def _run(self, func, *args, path):
+        return self._run_all([(func, args)], path)[0]
+
+    @staticmethod
+    def _join(results):
+        parts = []
+        for result in results:
+            if isinstance(result, list):
+                parts.extend(result)
+            else:
+                parts.append(result)
+        return "".join(parts)
+
+    def extract(self, path):
+        """Extract a CV's raw text, blocking the calling thread"""
+        if os.path.splitext(path)[1].lower() != ".pdf":
+            text = self._run(extract_text, path, path=path)
+        else:
+            page_count = self._run(count_pdf_pages, path, path=path)
+            if self.max_pages and page_count > self.max_pages:
+                logger.warning(f"{path} has {page_count} pages; extracting the first {self.max_pages}")
+                self.truncated += 1
+                page_count = self.max_pages
+            # Page ranges run in parallel as workers free up
+            text = self._join(self._run_all([
+                (extract_pdf_pages, (path, start, min(start + self.pages_per_task, page_count)))
+                for start in range(0, page_count, self.pages_per_task)
+            ], path))
+        self.completed += 1
+        return text
+
+    async def extract_async(self, path):
+        """Extract a CV's raw text without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.extract, path)
+
+    def _discard_pool(self, pool):
+        """Forget pool if it is still the current one; returns True if it was"""
+        with self._lock:
+            if self._pool is not pool:
+                return False
+            self._pool = None
+            return True
+
+    def _on_timeout(self, pool, path):
+        """Kill the pool running a stuck task so it cannot keep a worker busy"""
+        self.timeouts += 1
+        if not self._discard_pool(pool):
+            return
+        logger.error(f"CV extraction timed out for {path}; restarting the extraction pool")
+        # ProcessPoolExecutor cannot cancel running tasks, so stop the workers directly.
+        # Tasks of other documents on this pool fail with BrokenProcessPool and are resubmitted.
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        return {
+            "max_workers": self.max_workers,
+            "timeout": self.timeout,
+            "max_pages": self.max_pages,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "truncated": self.truncated,
+            "resubmitted": self.resubmitted
+        }
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+# Shared CV extraction pool
+cv_extractor = CVExtractor(
+    max_workers=settings.CV_EXTRACT_WORKERS,
+    timeout=settings.CV_EXTRACT_TIMEOUT,
+    max_pages=settings.CV_MAX_PAGES,
+    pages_per_task=settings.CV_PAGES_PER_TASK
+)
@@ -0,0 +1,130 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# CV job states, stored on the session as cv_status
+CV_STATUS_PENDING = "pending"
+CV_STATUS_PROCESSING = "processing"
+CV_STATUS_READY = "ready"
+CV_STATUS_FAILED = "failed"
+
+class CVQuestionJobs:
+    """
+    Generates CV questions in the background so session creation does not
+    wait on the CV parse and the Gemini call. Each job reports progress
+    through an on_update(status, questions, error) callback. Sessions that
+    upload the same CV at the same time share one job.
+    """
+
+    def __init__(self, max_workers=4, num_questions=5):
+        self.max_workers = max(1, int(max_workers))
+        self.num_questions = num_questions
+
+        self._executor = None
+        self._lock = threading.RLock()
+        self._in_flight = {}   # CV hash -> {"future", "waiters", "started"}
+
+        # Counters
+        self.submitted = 0
+        self.shared = 0
+        self.failed = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="cv-job"
+                    )
+        return self._executor
+
+    def submit(self, session_id, cv_path, sha256=None, on_update=None):
+        """Schedule question generation for a session's CV and return its Future"""
+        from services.cv_service import hash_file
+
+        sha256 = sha256 or hash_file(cv_path)
+        self._set_status(session_id, CV_STATUS_PENDING, on_update)
+
+        with self._lock:
+            job = self._in_flight.get(sha256)
+            if job is None:
+                job = {"waiters": [(session_id, on_update)], "started": False}
+                self._in_flight[sha256] = job
+                job["future"] = self._get_executor().submit(self._run, cv_path, sha256)
+                self.submitted += 1
+                started = False
+            else:
+                job["waiters"].append((session_id, on_update))
+                self.shared += 1
+                started = job["started"]
+            future = job["future"]
+
+        if started:
+            self._set_status(session_id, CV_STATUS_PROCESSING, on_update)
+        future.add_done_callback(lambda f: self._finish(session_id, sha256, f, on_update))
+        return future
+
+    def _run(self, cv_path, sha256):
+        from services.cv_service import get_cv_questions
+
+        with self._lock:
+            job = self._in_flight[sha256]
+            job["started"] = True
+            waiters = list(job["waiters"])
+        for session_id, on_update in waiters:
+            self._set_status(session_id, CV_STATUS_PROCESSING, on_update)
+
+        started = time.time()
+        questions = get_cv_questions(cv_path, sha256, self.num_questions)
+        logger.info(f"Generated {len(questions)} CV questions for {sha256[:12]} in {time.time() - started:.2f}s")
+        return questions
+
+    def _finish(self, session_id, sha256, future, on_update):
+        with self._lock:
+            job = self._in_flight.get(sha256)
+            if job is not None and job["future"] is future:
+                del self._in_flight[sha256]
+        try:
+            questions = future.result()
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"CV question job failed for session {session_id}: {e}")
+            self._set_status(session_id, CV_STATUS_FAILED, on_update, error=str(e))
+            return
+        if questions:
+            self._set_status(session_id, CV_STATUS_READY, on_update, questions=questions)
+        else:
+            self._set_status(session_id, CV_STATUS_FAILED, on_update, error="No text could be extracted from the CV")
+
+    def _set_status(self, session_id, status, on_update, questions=None, error=None):
+        if on_update:
+            try:
+                on_update(status, questions, error)
+            except Exception as e:
+                logger.error(f"Error recording CV status for session {session_id}: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": in_flight,
+            "submitted": self.submitted,
+            "shared": self.shared,
+            "failed": self.failed
+        }
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+# Shared CV job runner
+cv_jobs = CVQuestionJobs(max_workers=settings.CV_JOB_WORKERS)
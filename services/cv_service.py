@@ -1,69 +1,38 @@
 import os
-import PyPDF2
-import docx
-import io
-import fitz  # PyMuPDF for better PDF extraction
-from utils.gemini_utils import generate_content, generate_cv_questions_enhanced
+import hashlib
+from utils.gemini_utils import generate_content, generate_cv_questions_enhanced, CV_FALLBACK_QUESTIONS
+from services.cv_store import cv_store
+from services.cv_extract import cv_extractor
+from utils.text_normalizer import normalize_cv_text
+from utils.async_executor import llm_executor
+
+# Bump when extraction or question generation changes, so memoized results are recomputed
+CV_TEXT_VERSION = 2
+CV_QUESTIONS_VERSION = 1
 
 def extract_text_from_cv(cv_path):
     """Extract text content from a CV file (PDF or DOCX) with improved accuracy"""
-    text = ""
-    file_extension = os.path.splitext(cv_path)[1].lower()
-    
+    return clean_cv_text(extract_raw_text_from_cv(cv_path))
+
+def extract_raw_text_from_cv(cv_path):
+    """Extract the text of a CV file without cleaning it"""
     try:
-        if file_extension == '.pdf':
-            # Process PDF file using PyMuPDF for better extraction
-            try:
-                with fitz.open(cv_path) as pdf:
-                    for page in pdf:
-                        text += page.get_text()
-            except ImportError:
-                # Fallback to PyPDF2 if PyMuPDF is not available
-                with open(cv_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-        
-        elif file_extension in ['.docx', '.doc']:
-            # Process Word document
-            doc = docx.Document(cv_path)
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
-        
-        else:
-            # For text files or other formats
-            with open(cv_path, 'r', encoding='utf-8', errors='ignore') as file:
-                text = file.read()
-        
-        # Clean up the extracted text
-        text = clean_cv_text(text)
-        return text
+        return cv_extractor.extract(cv_path)
+    except Exception as e:
+        print(f"Error extracting text from CV: {e}")
+        return ""
+
+async def extract_raw_text_from_cv_async(cv_path):
+    """Extract the text of a CV file on the extraction pool without blocking the event loop"""
+    try:
+        return await cv_extractor.extract_async(cv_path)
     except Exception as e:
         print(f"Error extracting text from CV: {e}")
         return ""
 
 def clean_cv_text(text):
     """Clean and format extracted CV text"""
-    # Replace multiple newlines with a single newline
-    import re
-    text = re.sub(r'\n+', '\n', text)
-    
-    # Replace multiple spaces with a single space
-    text = re.sub(r' +', ' ', text)
-    
-    # Remove special characters that might interfere with analysis
-    text = text.replace('\x0c', ' ').replace('\t', ' ')
-    
-    return text.strip()
+    return normalize_cv_text(text)
 
 def save_uploaded_cv(file_content, filename, upload_dir="uploads"):
     """Save an uploaded CV and return the file path"""
@@ -75,6 +44,74 @@ def save_uploaded_cv(file_content, filename, upload_dir="uploads"):
     
     return file_path
 
+def hash_file(path, chunk_size=1024 * 1024):
+    """sha256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_cv_text(cv_path, sha256=None):
+    """Cleaned CV text, memoized per content hash in the CV store"""
+    sha256 = sha256 or hash_file(cv_path)
+    memo = cv_store.get_memo(sha256, "text", CV_TEXT_VERSION)
+    if memo is not None:
+        return memo["text"]
+
+    raw_text = extract_raw_text_from_cv(cv_path)
+    text = clean_cv_text(raw_text)
+    if text:
+        cv_store.set_memo(sha256, "text", CV_TEXT_VERSION, {"raw_text": raw_text, "text": text})
+    return text
+
+def cached_cv_questions(sha256, num_questions=5):
+    """Memoized CV questions for a content hash, or None if not generated yet"""
+    questions = cv_store.get_memo(sha256, "questions", CV_QUESTIONS_VERSION)
+    return questions[:num_questions] if questions else None
+
+def get_cv_questions(cv_path, sha256=None, num_questions=5):
+    """CV-based questions, memoized per content hash in the CV store"""
+    sha256 = sha256 or hash_file(cv_path)
+    questions = cv_store.get_memo(sha256, "questions", CV_QUESTIONS_VERSION)
+    if questions is None:
+        cv_text = get_cv_text(cv_path, sha256)
+        if not cv_text:
+            return []
+        questions = generate_cv_questions_enhanced(cv_text)
+        # Generic fallback questions mean generation failed; try again next time
+        if questions and questions != CV_FALLBACK_QUESTIONS:
+            cv_store.set_memo(sha256, "questions", CV_QUESTIONS_VERSION, questions)
+    return questions[:num_questions]
+
+async def get_cv_text_async(cv_path, sha256):
+    """Async get_cv_text; extraction runs on the process pool"""
+    memo = cv_store.get_memo(sha256, "text", CV_TEXT_VERSION)
+    if memo is not None:
+        return memo["text"]
+
+    raw_text = await extract_raw_text_from_cv_async(cv_path)
+    text = clean_cv_text(raw_text)
+    if text:
+        cv_store.set_memo(sha256, "text", CV_TEXT_VERSION, {"raw_text": raw_text, "text": text})
+    return text
+
+async def get_cv_questions_async(cv_path, sha256, num_questions=5, semaphore=None):
+    """Async get_cv_questions; the Gemini call runs on the LLM executor, limited by semaphore"""
+    questions = cv_store.get_memo(sha256, "questions", CV_QUESTIONS_VERSION)
+    if questions is None:
+        cv_text = await get_cv_text_async(cv_path, sha256)
+        if not cv_text:
+            return []
+        if semaphore is not None:
+            async with semaphore:
+                questions = await llm_executor.run(generate_cv_questions_enhanced, cv_text)
+        else:
+            questions = await llm_executor.run(generate_cv_questions_enhanced, cv_text)
+        if questions and questions != CV_FALLBACK_QUESTIONS:
+            cv_store.set_memo(sha256, "questions", CV_QUESTIONS_VERSION, questions)
+    return questions[:num_questions]
+
 def generate_cv_questions(cv_text, num_questions=5):
     """Generate interview questions based on CV content using enhanced Gemini prompting"""
     # Use the enhanced CV question generation with better prompting
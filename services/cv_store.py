@@ -0,0 +1,136 @@
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from config import settings
+from utils.session_log import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+class CVStore:
+    """
+    CV files stored once per content hash, under root/<aa>/<sha256>/.
+    Each CV directory holds the file itself and a meta.json with memoized
+    extraction results (raw text, cleaned text, generated questions), so a
+    CV uploaded again skips both the parse and the Gemini call.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, root, max_cached=256):
+        self.root = root
+        self.incoming_dir = os.path.join(root, "incoming")
+        self.max_cached = max_cached
+
+        self._meta = OrderedDict()  # sha256 -> meta dict
+        self._lock = threading.RLock()
+
+        # Counters
+        self.dedup_hits = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    def cv_dir(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def path_for(self, sha256):
+        """Path of the stored CV file, or None if the hash is unknown"""
+        filename = self.get_meta(sha256).get("filename")
+        if not filename:
+            return None
+        path = os.path.join(self.cv_dir(sha256), filename)
+        return path if os.path.exists(path) else None
+
+    def find(self, sha256):
+        """Path of an already stored CV, counted as a dedup hit; None if the hash is unknown"""
+        path = self.path_for(sha256)
+        if path:
+            with self._lock:
+                self.dedup_hits += 1
+        return path
+
+    def adopt(self, tmp_path, sha256, original_name=None):
+        """
+        Move a freshly uploaded file into the store under its hash.
+        If the same content is already stored the upload is discarded.
+        Returns (stored_path, is_new).
+        """
+        with self._lock:
+            existing = self.path_for(sha256)
+            if existing:
+                os.remove(tmp_path)
+                self.dedup_hits += 1
+                return existing, False
+
+            extension = os.path.splitext(original_name or tmp_path)[1].lower()
+            filename = f"cv{extension}"
+            cv_dir = self.cv_dir(sha256)
+            os.makedirs(cv_dir, exist_ok=True)
+            path = os.path.join(cv_dir, filename)
+            os.replace(tmp_path, path)
+            self.update_meta(sha256, filename=filename, original_name=original_name)
+            return path, True
+
+    def get_meta(self, sha256):
+        """Memoized metadata for a CV hash (empty dict if none)"""
+        with self._lock:
+            meta = self._meta.get(sha256)
+            if meta is not None:
+                self._meta.move_to_end(sha256)
+                return meta
+            path = os.path.join(self.cv_dir(sha256), self.META_FILE)
+            meta = {}
+            if os.path.exists(path):
+                try:
+                    with open(path, "r") as f:
+                        meta = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable CV metadata {path}: {e}")
+            self._remember(sha256, meta)
+            return meta
+
+    def update_meta(self, sha256, **fields):
+        """Merge fields into a CV's metadata and persist it"""
+        with self._lock:
+            meta = dict(self.get_meta(sha256))
+            meta.update(fields)
+            cv_dir = self.cv_dir(sha256)
+            os.makedirs(cv_dir, exist_ok=True)
+            write_json_atomic(os.path.join(cv_dir, self.META_FILE), meta)
+            self._remember(sha256, meta)
+            return meta
+
+    def get_memo(self, sha256, key, version):
+        """A memoized result, or None if missing or from an older version"""
+        entry = self.get_meta(sha256).get("memo", {}).get(key)
+        if entry is None or entry.get("version") != version:
+            self.memo_misses += 1
+            return None
+        self.memo_hits += 1
+        return entry.get("value")
+
+    def set_memo(self, sha256, key, version, value):
+        with self._lock:
+            memo = dict(self.get_meta(sha256).get("memo", {}))
+            memo[key] = {"version": version, "value": value}
+            self.update_meta(sha256, memo=memo)
+
+    def _remember(self, sha256, meta):
+        self._meta[sha256] = meta
+        self._meta.move_to_end(sha256)
+        while len(self._meta) > self.max_cached:
+            self._meta.popitem(last=False)
+
+    def get_stats(self):
+        return {
+            "root": self.root,
+            "cached_meta": len(self._meta),
+            "dedup_hits": self.dedup_hits,
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses
+        }
+
+# Shared CV store
+cv_store = CVStore(settings.CV_STORE_DIR)
@@ -1,65 +1,49 @@
 import os
-import json
 import time
-import pandas as pd
 from datetime import datetime
 from config import settings
-from utils.gemini_utils import generate_content
+from utils.session_log import session_logs
+from utils.ids import new_session_id
+from utils.session_paths import session_dir
+from services.question_bank import get_question_bank, QuestionCursor
+from services.question_selector import question_selector
 
 class InterviewSession:
     def __init__(self, session_id=None, cv_path=None):
-        self.session_id = session_id or f"session_{int(time.time())}"
-        self.session_dir = os.path.join(settings.SESSION_DIR, self.session_id)
+        self.session_id = session_id or new_session_id()
+        self.session_dir = session_dir(settings.SESSION_DIR, self.session_id)
         os.makedirs(self.session_dir, exist_ok=True)
         self.cv_path = cv_path
         self.transcript = []
-        self.questions_df = self._load_questions()
+        
+        # Interactions are appended to a log rather than rewriting transcript.json each turn
+        transcript_log = self.transcript_log
+        state = transcript_log.replay() if transcript_log.exists() else None
+        if state is not None:
+            self.transcript = state.get("transcript", [])
+        else:
+            transcript_log.create({"session_id": self.session_id, "transcript": []})
+        # Questions come from the shared bank; the session only tracks its position
+        self._question_cursor = QuestionCursor()
         self.cv_questions = []
+        self.cv_status = None
         
-        # If CV provided, generate CV-based questions
+        # If CV provided, generate CV-based questions in the background
         if cv_path:
-            from services.cv_service import extract_text_from_cv, generate_cv_questions
-            cv_text = extract_text_from_cv(cv_path)
-            if cv_text:
-                self.cv_questions = generate_cv_questions(cv_text)
+            from services.cv_jobs import cv_jobs, CV_STATUS_PENDING
+            self.cv_status = CV_STATUS_PENDING
+            cv_jobs.submit(self.session_id, cv_path, on_update=self._on_cv_update)
     
-    def _load_questions(self):
-        """Load interview questions from CSV"""
-        try:
-            # Try loading from the settings.QUESTIONS_CSV path
-            df = pd.read_csv(settings.QUESTIONS_CSV)
-            print(f"Successfully loaded questions from {settings.QUESTIONS_CSV}")
-            return df
-        except Exception as e:
-            print(f"Error loading questions from {settings.QUESTIONS_CSV}: {e}")
-            
-            # Try the alternative path
-            try:
-                alt_path = settings.questions_csv_path
-                df = pd.read_csv(alt_path)
-                print(f"Successfully loaded questions from alternate path {alt_path}")
-                return df
-            except Exception as e2:
-                print(f"Error loading questions from alternate path {alt_path}: {e2}")
-                
-                # Create a default dataframe with sample questions
-                print("Creating default questions")
-                return pd.DataFrame({
-                    'Question': [
-                        'Can you explain your business model?',
-                        'What is your target market?',
-                        'How do you plan to scale your business?',
-                        'What is your customer acquisition strategy?',
-                        'How do you differentiate from competitors?'
-                    ],
-                    'Expected Response': [
-                        'Clear explanation of value proposition and revenue generation.',
-                        'Specific demographic or market segment with justification.',
-                        "Detailed growth strategy that's realistic and achievable.",
-                        'Cost-effective marketing and sales approach.',
-                        'Unique value proposition and competitive advantages.'
-                    ]
-                })
+    @property
+    def transcript_log(self):
+        """The transcript log, looked up in the registry so it counts towards the open-log limit"""
+        return session_logs.get(self.session_dir, name="transcript")
+
+    def _on_cv_update(self, status, questions=None, error=None):
+        """Pick up CV questions once the background job finishes"""
+        if questions:
+            self.cv_questions = questions
+        self.cv_status = status
     
     def record_interaction(self, speaker, text, audio_data=None):
         """Record an interaction in the session transcript"""
@@ -79,9 +63,11 @@ class InterviewSession:
         
         self.transcript.append(interaction)
         
-        # Save updated transcript
-        with open(os.path.join(self.session_dir, "transcript.json"), 'w') as f:
-            json.dump(self.transcript, f)
+        # Save the interaction to the transcript log
+        transcript_log = self.transcript_log
+        transcript_log.append("append", "transcript", interaction)
+        if transcript_log.needs_compaction():
+            transcript_log.compact({"session_id": self.session_id, "transcript": self.transcript})
         
         return interaction
     
@@ -97,47 +83,26 @@ class InterviewSession:
         if not previous_responses:
             previous_responses = []
         
-        # If we have CV questions and haven't asked them all yet
-        if self.cv_questions and len(previous_questions) < len(self.cv_questions):
-            return self.cv_questions[len(previous_questions)]
+        # Ask CV questions first once they are ready; until then use standard questions
+        for q in self.cv_questions:
+            if q not in previous_questions:
+                return q
         
-        # Get standard questions
-        standard_questions = self.questions_df['Question'].tolist()
+        # Standard questions from the shared bank
+        cursor = self._question_cursor
+        cursor.sync(get_question_bank(), previous_questions)
         
-        # If we've asked all CV questions but no standard questions yet
-        if len(previous_questions) == len(self.cv_questions) and len(previous_questions) < len(self.cv_questions) + len(standard_questions):
-            return standard_questions[0]
+        # First standard question, or no responses to choose by
+        if not cursor.asked or not previous_responses:
+            return cursor.next_question()
         
-        # Use Gemini to determine the best follow-up question
-        remaining_questions = [q for q in standard_questions if q not in previous_questions]
+        # Pick the remaining question closest to the candidate's recent answers
+        remaining_ids = cursor.remaining_ids()
         
-        if not remaining_questions:
+        if not remaining_ids:
             return None  # No more questions to ask
         
-        if not previous_responses:
-            return remaining_questions[0]  # First standard question
-        
-        # Use Gemini to select next question
-        prompt = f"""
-        Based on the candidate's previous responses:
-        {' '.join(previous_responses)}
-        
-        Which of these remaining questions would be most valuable to ask next?
-        Options: {remaining_questions}
-        
-        Return only the question text.
-        """
-        
-        suggested_question = generate_content(prompt)
-        
-        # Ensure the question exists in our list
-        if suggested_question in remaining_questions:
-            return suggested_question
-        else:
-            # Default to the next sequential question
-            for q in standard_questions:
-                if q not in previous_questions:
-                    return q
+        return question_selector.select(cursor.bank, remaining_ids, previous_responses)
 
 # Session management
 active_sessions = {}
@@ -0,0 +1,222 @@
+import os
+import csv
+import time
+import logging
+import threading
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Questions the router falls back to when Gemini is unavailable
+PREDEFINED_QUESTIONS = [
+    "Can you tell me about your business model?",
+    "What is your target market?",
+    "How do you plan to scale your business?",
+    "What are your competitive advantages?",
+    "How do you plan to use the funds you're seeking?"
+]
+
+# Questions used when no question CSV can be loaded
+DEFAULT_QUESTIONS = [
+    ('Can you explain your business model?',
+     'Clear explanation of value proposition and revenue generation.'),
+    ('What is your target market?',
+     'Specific demographic or market segment with justification.'),
+    ('How do you plan to scale your business?',
+     "Detailed growth strategy that's realistic and achievable."),
+    ('What is your customer acquisition strategy?',
+     'Cost-effective marketing and sales approach.'),
+    ('How do you differentiate from competitors?',
+     'Unique value proposition and competitive advantages.')
+]
+
+def question_csv_paths():
+    """Question CSV locations in the order InterviewSession tries them"""
+    return [settings.QUESTIONS_CSV, settings.questions_csv_path]
+
+def read_question_csv(path):
+    """Read (question, expected response) rows from a question CSV"""
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            question = (row.get("Question") or row.get("question") or "").strip()
+            if question:
+                expected = row.get("Expected Response") or row.get("expected_response") or ""
+                rows.append((question, expected.strip()))
+    return rows
+
+def load_question_rows(paths=None):
+    """Load question rows from the first readable CSV, falling back to the defaults"""
+    for path in paths or question_csv_paths():
+        if not path or not os.path.exists(path):
+            continue
+        try:
+            rows = read_question_csv(path)
+        except Exception as e:
+            logger.error(f"Error loading questions from {path}: {e}")
+            continue
+        if rows:
+            return rows
+    logger.warning("No question CSV could be loaded, using default questions")
+    return list(DEFAULT_QUESTIONS)
+
+class QuestionBank:
+    """
+    Immutable snapshot of the question bank: questions and expected
+    responses as tuples, plus a hash index from question text to ID.
+    Shared by every session; sessions track their progress with a
+    QuestionCursor instead of copying it.
+    """
+
+    __slots__ = ("questions", "expected", "ids", "source", "version")
+
+    def __init__(self, rows, source=None, version=0):
+        ids = {}
+        questions = []
+        expected = []
+        for question, expected_response in rows:
+            if question not in ids:
+                ids[question] = len(questions)
+                questions.append(question)
+                expected.append(expected_response)
+        self.questions = tuple(questions)
+        self.expected = tuple(expected)
+        self.ids = ids
+        self.source = source
+        self.version = version
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __contains__(self, question):
+        return question in self.ids
+
+    def __iter__(self):
+        return iter(self.questions)
+
+    def id_of(self, question):
+        """ID of a question, or None if it is not in the bank"""
+        return self.ids.get(question)
+
+    def expected_for(self, question):
+        question_id = self.ids.get(question)
+        return self.expected[question_id] if question_id is not None else None
+
+class QuestionCursor:
+    """
+    One session's progress through the shared bank: the IDs already asked
+    and the position of the first unasked question. previous_questions only
+    grows during an interview, so each sync handles just the new entries and
+    the position only moves forward, making next_question O(1) amortized.
+    """
+
+    __slots__ = ("bank", "asked", "position", "seen")
+
+    def __init__(self):
+        self.bank = None
+        self.asked = set()
+        self.position = 0
+        self.seen = 0
+
+    def sync(self, bank, previous_questions):
+        """Bring the cursor up to date with the questions asked so far"""
+        if bank is not self.bank or len(previous_questions) < self.seen:
+            # New bank version or a different history: start over
+            self.bank = bank
+            self.asked = set()
+            self.position = 0
+            self.seen = 0
+        for question in previous_questions[self.seen:]:
+            question_id = bank.ids.get(question)
+            if question_id is not None:
+                self.asked.add(question_id)
+        self.seen = len(previous_questions)
+
+    def next_question(self):
+        """First question in bank order that has not been asked, or None"""
+        questions = self.bank.questions
+        while self.position < len(questions) and self.position in self.asked:
+            self.position += 1
+        return questions[self.position] if self.position < len(questions) else None
+
+    def remaining_ids(self):
+        """IDs of all unasked questions in bank order"""
+        return [i for i in range(self.position, len(self.bank.questions)) if i not in self.asked]
+
+    def remaining(self):
+        """All unasked questions in bank order"""
+        questions = self.bank.questions
+        return [questions[i] for i in self.remaining_ids()]
+
+    def is_remaining(self, question):
+        question_id = self.bank.ids.get(question)
+        return question_id is not None and question_id not in self.asked
+
+class QuestionBankLoader:
+    """
+    Holds the process-wide QuestionBank. The source CSVs' mtimes are checked
+    at most every check_interval seconds and the bank is rebuilt when they
+    change; readers always get a complete, immutable snapshot.
+    """
+
+    def __init__(self, paths=None, check_interval=5.0):
+        self.paths = paths
+        self.check_interval = check_interval
+        self._bank = None
+        self._signature = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _candidate_paths(self):
+        return [path for path in (self.paths or question_csv_paths()) if path]
+
+    def _current_signature(self):
+        signature = []
+        for path in self._candidate_paths():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def get(self):
+        """Current question bank, reloading it if the CSV changed"""
+        bank = self._bank
+        now = time.time()
+        if bank is not None and now - self._last_check < self.check_interval:
+            return bank
+        with self._lock:
+            if self._bank is not None and now - self._last_check < self.check_interval:
+                return self._bank
+            self._last_check = now
+            signature = self._current_signature()
+            if self._bank is None or signature != self._signature:
+                self._load(signature)
+            return self._bank
+
+    def reload(self):
+        """Rebuild the bank from the CSV now"""
+        with self._lock:
+            self._last_check = time.time()
+            self._load(self._current_signature())
+            return self._bank
+
+    def _load(self, signature):
+        source = next((path for path, mtime, _ in signature if mtime is not None), None)
+        rows = load_question_rows(self._candidate_paths())
+        version = self._bank.version + 1 if self._bank is not None else 0
+        self._bank = QuestionBank(rows, source=source, version=version)
+        self._signature = signature
+        if version:
+            self.reloads += 1
+        logger.info(f"Loaded {len(self._bank)} questions from {source or 'defaults'} (version {version})")
+
+# Process-wide question bank
+question_bank_loader = QuestionBankLoader(check_interval=settings.QUESTION_BANK_CHECK_INTERVAL)
+
+def get_question_bank():
+    """The shared, immutable question bank"""
+    return question_bank_loader.get()
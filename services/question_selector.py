@@ -0,0 +1,202 @@
+import re
+import logging
+import threading
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that carry no signal for choosing between interview questions
+_STOP_WORDS = frozenset("""
+a about after all also am an and any are as at be because been being but by can could did do does
+doing for from had has have having he her here him his how i if in into is it its just me more most
+my no not now of on or our out over own so some such than that the their them then there these they
+this those through to too up very was we were what when where which while who why will with would
+you your yours
+""".split())
+
+def tokenize(text):
+    """Lowercase word tokens without stop words"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOP_WORDS and len(token) > 1]
+
+class QuestionIndex:
+    """
+    TF-IDF vectors for every question in a QuestionBank, built once per
+    bank version. Each question is represented by its text plus its
+    expected response, so a candidate's answer can match the topic a
+    question covers and not only its wording. Rows are L2-normalized, so
+    cosine similarity against all questions is one matrix-vector product.
+    NumPy is imported when the first index is built, not at startup.
+    """
+
+    def __init__(self, bank):
+        import numpy as np
+
+        self.bank = bank
+        documents = [
+            tokenize(question) + tokenize(expected)
+            for question, expected in zip(bank.questions, bank.expected)
+        ]
+
+        vocabulary = {}
+        for tokens in documents:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        self.vocabulary = vocabulary
+
+        counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+        for row, tokens in enumerate(documents):
+            for token in tokens:
+                counts[row, vocabulary[token]] += 1
+
+        # Smoothed IDF as in scikit-learn: log((1 + n) / (1 + df)) + 1
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        # Sublinear term frequency keeps repeated words from dominating
+        matrix = np.zeros_like(counts)
+        np.log1p(counts, out=matrix, where=counts > 0)
+        matrix *= self.idf
+        self.matrix = _normalize_rows(matrix)
+
+    def vectorize(self, texts, weights=None):
+        """Normalized TF-IDF vector for one or more texts, optionally weighted per text"""
+        import numpy as np
+
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for i, text in enumerate(texts):
+            counts = {}
+            for token in tokenize(text):
+                column = self.vocabulary.get(token)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            if not counts:
+                continue
+            columns = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            tf = np.log1p(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            part = tf * self.idf[columns]
+            part /= np.linalg.norm(part)
+            vector[columns] += part * (weights[i] if weights is not None else 1.0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def scores(self, vector, question_ids=None):
+        """Cosine similarity of vector to every question, or to question_ids only"""
+        matrix = self.matrix if question_ids is None else self.matrix[question_ids]
+        return matrix @ vector
+
+def _normalize_rows(matrix):
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class QuestionSelector:
+    """
+    Picks the next standard question for a session locally: the remaining
+    question most similar to the candidate's recent responses, with newer
+    responses weighted more. Falls back to bank order when nothing matches.
+    With rerank_with_llm, the top candidates are passed to Gemini to choose
+    from, and the local ranking is used if the reply is not one of them.
+    """
+
+    def __init__(self, history=3, decay=0.5, min_score=0.05, rerank_with_llm=False, rerank_top_k=3):
+        self.history = max(1, int(history))
+        self.decay = decay
+        self.min_score = min_score
+        self.rerank_with_llm = rerank_with_llm
+        self.rerank_top_k = max(2, int(rerank_top_k))
+
+        self._index = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.selections = 0
+        self.fallbacks = 0
+        self.reranks = 0
+        self.rerank_misses = 0
+
+    def index_for(self, bank):
+        """Index for a bank version, building it on first use"""
+        index = self._index
+        if index is not None and index.bank is bank:
+            return index
+        with self._lock:
+            if self._index is None or self._index.bank is not bank:
+                self._index = QuestionIndex(bank)
+                logger.info(f"Built question index: {len(bank)} questions, {len(self._index.vocabulary)} terms")
+            return self._index
+
+    def rank(self, bank, question_ids, previous_responses):
+        """(question_id, score) pairs for question_ids, most relevant first"""
+        if not question_ids:
+            return []
+        index = self.index_for(bank)
+        recent = [response for response in previous_responses[-self.history:] if response]
+        # The latest response gets weight 1, the one before it decay, and so on
+        weights = [self.decay ** (len(recent) - 1 - i) for i in range(len(recent))]
+        vector = index.vectorize(recent, weights)
+        scores = index.scores(vector, question_ids)
+        # Stable sort keeps bank order among equal scores
+        order = (-scores).argsort(kind="stable")
+        return [(question_ids[i], float(scores[i])) for i in order]
+
+    def select(self, bank, question_ids, previous_responses):
+        """Best next question among question_ids, or None if there are none"""
+        ranked = self.rank(bank, question_ids, previous_responses)
+        if not ranked:
+            return None
+        self.selections += 1
+        if ranked[0][1] < self.min_score:
+            self.fallbacks += 1
+            return bank.questions[min(question_ids)]
+        if self.rerank_with_llm and len(ranked) > 1:
+            question = self._rerank(bank, ranked[:self.rerank_top_k], previous_responses)
+            if question:
+                return question
+        return bank.questions[ranked[0][0]]
+
+    def _rerank(self, bank, candidates, previous_responses):
+        from utils.gemini_utils import generate_content
+
+        options = [bank.questions[question_id] for question_id, _ in candidates]
+        prompt = f"""
+        Based on the candidate's previous responses:
+        {' '.join(previous_responses[-self.history:])}
+
+        Which of these questions would be most valuable to ask next?
+        Options: {options}
+
+        Return only the question text.
+        """
+        self.reranks += 1
+        try:
+            suggested = (generate_content(prompt) or "").strip().strip('"')
+        except Exception as e:
+            logger.error(f"Error re-ranking questions: {e}")
+            suggested = None
+        if suggested in options:
+            return suggested
+        self.rerank_misses += 1
+        return None
+
+    def get_stats(self):
+        index = self._index
+        return {
+            "questions_indexed": len(index.bank) if index else 0,
+            "terms": len(index.vocabulary) if index else 0,
+            "selections": self.selections,
+            "fallbacks": self.fallbacks,
+            "reranks": self.reranks,
+            "rerank_misses": self.rerank_misses
+        }
+
+# Shared selector; the index is rebuilt when the question bank reloads
+question_selector = QuestionSelector(
+    history=settings.QUESTION_SELECT_HISTORY,
+    rerank_with_llm=settings.QUESTION_RERANK_WITH_LLM,
+    rerank_top_k=settings.QUESTION_RERANK_TOP_K
+)
@@ -0,0 +1,173 @@
+import re
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+# Word valences on a -3..3 scale, tuned for founders answering investor questions
+_LEXICON = {
+    # Positive
+    "achieved": 2.0, "advantage": 1.5, "ahead": 1.0, "ambitious": 1.5, "best": 2.0, "better": 1.5,
+    "clear": 1.0, "confident": 2.0, "committed": 1.5, "differentiated": 1.5, "effective": 1.5,
+    "efficient": 1.5, "excellent": 2.5, "excited": 2.0, "exciting": 2.0, "expanding": 1.5, "experienced": 1.5,
+    "expert": 1.5, "good": 1.5, "great": 2.0, "grew": 1.5, "grow": 1.0, "growing": 1.5, "growth": 1.5,
+    "happy": 2.0, "improve": 1.0, "improved": 1.5, "innovative": 1.5, "leading": 1.5, "love": 2.0,
+    "loyal": 1.5, "opportunity": 1.5, "passionate": 2.0, "positive": 1.5, "profitable": 2.0, "profit": 1.5,
+    "proven": 2.0, "record": 1.0, "recurring": 1.0, "retention": 1.0, "scalable": 1.5, "strong": 2.0,
+    "strongest": 2.5, "succeed": 2.0, "success": 2.0, "successful": 2.0, "sustainable": 1.5, "traction": 1.5,
+    "unique": 1.5, "validated": 1.5, "win": 2.0, "winning": 2.0, "won": 2.0,
+    # Negative
+    "bad": -2.0, "burn": -1.0, "challenge": -0.5, "challenging": -1.0, "churn": -1.5, "concern": -1.5,
+    "concerned": -1.5, "decline": -2.0, "declined": -2.0, "declining": -2.0, "difficult": -1.5, "doubt": -1.5,
+    "fail": -2.5, "failed": -2.5, "failing": -2.5, "failure": -2.5, "hard": -1.0, "lose": -2.0, "losing": -2.0,
+    "loss": -2.0, "losses": -2.0, "lost": -2.0, "poor": -2.0, "problem": -1.5, "problems": -1.5, "risk": -1.0,
+    "risky": -1.5, "slow": -1.0, "struggle": -2.0, "struggled": -2.0, "struggling": -2.0, "stuck": -1.5,
+    "unclear": -1.5, "unfortunately": -1.5, "unprofitable": -2.0, "unsure": -2.0, "weak": -2.0, "worried": -2.0,
+    "worse": -2.0, "worst": -2.5,
+}
+
+# Words that flip the valence of the next few words
+_NEGATIONS = frozenset(["not", "no", "never", "neither", "nor", "without", "hardly", "cannot"])
+_NEGATION_WINDOW = 3
+_NEGATION_FACTOR = -0.75
+
+# Words that strengthen the next word
+_BOOSTERS = {"very": 0.3, "extremely": 0.5, "really": 0.2, "highly": 0.3, "incredibly": 0.5, "significantly": 0.3}
+
+# Hedges lower the magnitude of an answer, not its direction
+_HEDGES = frozenset(["maybe", "perhaps", "probably", "possibly", "guess", "hopefully", "somewhat", "might"])
+
+# Normalization constant for the summed valence, as in VADER
+_ALPHA = 15.0
+
+class SentimentEngine:
+    """
+    Local lexicon-based sentiment scorer. Each answer gets a score in
+    [-1, 1], a magnitude in [0, 1] and a label, with negation, boosters
+    and hedging taken into account. A single answer is scored in plain
+    Python; batches are scored together, with token valences gathered into
+    flat arrays and summed per answer with NumPy, which is only imported
+    for the first batch.
+    """
+
+    def __init__(self, lexicon=None):
+        lexicon = lexicon or _LEXICON
+        self.vocabulary = {word: i for i, word in enumerate(lexicon)}
+        self.valences = list(lexicon.values())
+        self._valence_array = None
+
+    def _matches(self, tokens):
+        """(vocabulary index, multiplier) for each lexicon word in a token list, and the hedge count"""
+        matches = []
+        hedges = 0
+        negate_until = -1
+        boost = 0.0
+        for position, token in enumerate(tokens):
+            if token in _NEGATIONS or token.endswith("n't"):
+                negate_until = position + _NEGATION_WINDOW
+                continue
+            if token in _BOOSTERS:
+                boost += _BOOSTERS[token]
+                continue
+            if token in _HEDGES:
+                hedges += 1
+                continue
+            index = self.vocabulary.get(token)
+            if index is not None:
+                multiplier = 1.0 + boost
+                if position <= negate_until:
+                    multiplier *= _NEGATION_FACTOR
+                matches.append((index, multiplier))
+            boost = 0.0
+        return matches, hedges
+
+    def score_batch(self, texts):
+        """Sentiment dicts for a list of texts, in order"""
+        if not texts:
+            return []
+        import numpy as np
+
+        if self._valence_array is None:
+            self._valence_array = np.asarray(self.valences, dtype=np.float64)
+        doc_ids, word_ids, multipliers = [], [], []
+        hedge_counts = np.zeros(len(texts))
+        for doc, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall((text or "").lower())
+            matches, hedges = self._matches(tokens)
+            hedge_counts[doc] = hedges
+            for index, multiplier in matches:
+                doc_ids.append(doc)
+                word_ids.append(index)
+                multipliers.append(multiplier)
+
+        doc_ids = np.asarray(doc_ids, dtype=np.intp)
+        values = self._valence_array[np.asarray(word_ids, dtype=np.intp)] * np.asarray(multipliers)
+        totals = np.bincount(doc_ids, weights=values, minlength=len(texts))
+        absolute = np.bincount(doc_ids, weights=np.abs(values), minlength=len(texts))
+        matched = np.bincount(doc_ids, minlength=len(texts))
+
+        scores = totals / np.sqrt(totals * totals + _ALPHA)
+        # Strength of the sentiment regardless of direction, damped by hedging
+        magnitudes = absolute / np.sqrt(absolute * absolute + _ALPHA) / (1 + 0.5 * hedge_counts)
+
+        return [
+            self._result(float(scores[i]), float(magnitudes[i]), int(matched[i]), int(hedge_counts[i]))
+            for i in range(len(texts))
+        ]
+
+    def score(self, text):
+        """Sentiment dict for one text"""
+        matches, hedges = self._matches(_TOKEN_RE.findall((text or "").lower()))
+        values = [self.valences[index] * multiplier for index, multiplier in matches]
+        total = sum(values)
+        absolute = sum(abs(value) for value in values)
+        score = total / math.sqrt(total * total + _ALPHA)
+        magnitude = absolute / math.sqrt(absolute * absolute + _ALPHA) / (1 + 0.5 * hedges)
+        return self._result(score, magnitude, len(matches), hedges)
+
+    @staticmethod
+    def _result(score, magnitude, matched, hedges):
+        if score >= 0.05:
+            label = "positive"
+        elif score <= -0.05:
+            label = "negative"
+        else:
+            label = "neutral"
+        explanation = f"Lexicon score from {matched} sentiment term{'s' if matched != 1 else ''}"
+        if hedges:
+            explanation += f", {hedges} hedge{'s' if hedges != 1 else ''}"
+        return {
+            "score": round(score, 3),
+            "magnitude": round(magnitude, 3),
+            "sentiment": label,
+            "explanation": explanation,
+            "source": "lexicon"
+        }
+
+# Shared sentiment engine
+sentiment_engine = SentimentEngine()
+
+def score_sentiment(text):
+    """Instant local sentiment for an interview answer"""
+    return sentiment_engine.score(text)
+
+def score_sentiments(texts):
+    """Instant local sentiment for a batch of answers"""
+    return sentiment_engine.score_batch(texts)
+
+def summarize_sentiments(texts):
+    """Per-answer sentiment for a whole interview, scored as one batch, with the average across answers"""
+    answers = score_sentiments(texts)
+    if not answers:
+        return {"answers": [], "average_score": 0.0, "average_magnitude": 0.0, "sentiment": "neutral"}
+    average_score = sum(answer["score"] for answer in answers) / len(answers)
+    average_magnitude = sum(answer["magnitude"] for answer in answers) / len(answers)
+    overall = SentimentEngine._result(average_score, average_magnitude, 0, 0)
+    return {
+        "answers": answers,
+        "average_score": overall["score"],
+        "average_magnitude": overall["magnitude"],
+        "sentiment": overall["sentiment"]
+    }
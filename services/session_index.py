@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import base64
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Columns that sessions can be listed by
+SORT_FIELDS = ("created_at", "updated_at", "question_count", "response_count")
+
+def summarize_session(session):
+    """Index row values for a session dict"""
+    now = time.time()
+    return {
+        "session_id": session["session_id"],
+        "created_at": session.get("created_at") or now,
+        "updated_at": now,
+        "question_count": len(session.get("questions", [])),
+        "response_count": len(session.get("responses", [])),
+        "has_cv": 1 if session.get("cv_path") else 0,
+        "has_feedback": 1 if session.get("feedback") else 0
+    }
+
+def encode_cursor(sort_value, session_id):
+    """Opaque cursor pointing just after a row"""
+    raw = json.dumps([sort_value, session_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor"""
+    try:
+        sort_value, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return sort_value, session_id
+
+class SessionIndex:
+    """
+    Summary rows for every session in a SQLite table, kept up to date as
+    sessions change. Listing uses keyset pagination over (sort column,
+    session_id) indexes, so reading a page costs the same however many
+    sessions exist.
+    """
+
+    _SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS session_index (
+            session_id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            question_count INTEGER NOT NULL DEFAULT 0,
+            response_count INTEGER NOT NULL DEFAULT 0,
+            has_cv INTEGER NOT NULL DEFAULT 0,
+            has_feedback INTEGER NOT NULL DEFAULT 0
+        )""",
+    ] + [
+        f"CREATE INDEX IF NOT EXISTS idx_session_index_{field} ON session_index({field}, session_id)"
+        for field in SORT_FIELDS
+    ]
+
+    _UPSERT = (
+        "INSERT OR REPLACE INTO session_index "
+        "(session_id, created_at, updated_at, question_count, response_count, has_cv, has_feedback) "
+        "VALUES (:session_id, :created_at, :updated_at, :question_count, :response_count, :has_cv, :has_feedback)"
+    )
+    _BUMP_QUESTIONS = "UPDATE session_index SET question_count = question_count + 1, updated_at = ? WHERE session_id = ?"
+    _BUMP_RESPONSES = "UPDATE session_index SET response_count = response_count + 1, updated_at = ? WHERE session_id = ?"
+    _SET_FEEDBACK = "UPDATE session_index SET has_feedback = ?, updated_at = ? WHERE session_id = ?"
+    _SET_CV = "UPDATE session_index SET has_cv = ?, updated_at = ? WHERE session_id = ?"
+    _TOUCH = "UPDATE session_index SET updated_at = ? WHERE session_id = ?"
+    _DELETE = "DELETE FROM session_index WHERE session_id = ?"
+    _COUNT = "SELECT COUNT(*) FROM session_index"
+    _LIST_IDS = "SELECT session_id FROM session_index ORDER BY created_at, session_id"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = self._conn()
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None, cached_statements=64, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def upsert(self, session):
+        """Write the full summary row for a session"""
+        self._conn().execute(self._UPSERT, summarize_session(session))
+
+    def upsert_many(self, sessions):
+        """Write summary rows for several sessions in one transaction"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self._UPSERT, [summarize_session(session) for session in sessions])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def apply(self, session_id, op, field, value):
+        """Update counters for one logged session change"""
+        now = time.time()
+        conn = self._conn()
+        if op == "append" and field == "questions":
+            conn.execute(self._BUMP_QUESTIONS, (now, session_id))
+        elif op == "append" and field == "responses":
+            conn.execute(self._BUMP_RESPONSES, (now, session_id))
+        elif op == "set" and field == "feedback":
+            conn.execute(self._SET_FEEDBACK, (1 if value else 0, now, session_id))
+        elif op == "set" and field == "cv_path":
+            conn.execute(self._SET_CV, (1 if value else 0, now, session_id))
+        else:
+            conn.execute(self._TOUCH, (now, session_id))
+
+    def remove(self, session_id):
+        self._conn().execute(self._DELETE, (session_id,))
+
+    def count(self):
+        return self._conn().execute(self._COUNT).fetchone()[0]
+
+    def list_ids(self):
+        return [row[0] for row in self._conn().execute(self._LIST_IDS)]
+
+    def rebuild(self, sessions):
+        """Replace the index with summaries of the given session dicts"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM session_index")
+            count = 0
+            for session in sessions:
+                if session:
+                    conn.execute(self._UPSERT, summarize_session(session))
+                    count += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Rebuilt session index with {count} sessions")
+        return count
+
+    def query(self, limit=50, cursor=None, sort="created_at", descending=True,
+              has_cv=None, has_feedback=None, min_responses=None, created_after=None, created_before=None):
+        """
+        Get one page of session summaries.
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort}; use one of {', '.join(SORT_FIELDS)}")
+        limit = max(1, min(int(limit), 500))
+
+        clauses = []
+        params = []
+        if has_cv is not None:
+            clauses.append("has_cv = ?")
+            params.append(1 if has_cv else 0)
+        if has_feedback is not None:
+            clauses.append("has_feedback = ?")
+            params.append(1 if has_feedback else 0)
+        if min_responses is not None:
+            clauses.append("response_count >= ?")
+            params.append(int(min_responses))
+        if created_after is not None:
+            clauses.append("created_at > ?")
+            params.append(float(created_after))
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(float(created_before))
+        if cursor:
+            sort_value, session_id = decode_cursor(cursor)
+            # Row-value comparison keeps the seek on the (sort, session_id) index
+            clauses.append(f"({sort}, session_id) {'<' if descending else '>'} (?, ?)")
+            params.extend([sort_value, session_id])
+
+        direction = "DESC" if descending else "ASC"
+        sql = "SELECT * FROM session_index"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {sort} {direction}, session_id {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        rows = [dict(row) for row in self._conn().execute(sql, params)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last[sort], last["session_id"])
+
+        for row in rows:
+            row["has_cv"] = bool(row["has_cv"])
+            row["has_feedback"] = bool(row["has_feedback"])
+        return rows, next_cursor
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,67 @@
+"""
+Move session directories from the legacy flat layout into shard directories.
+
+Usage:
+    python -m services.session_migrate [--dir PATH ...] [--dry-run]
+
+Session IDs are unchanged; only the directories move, from sessions/<id> to
+sessions/<aa>/<bb>/<id>. Run it with the API stopped. Sessions that have not
+been migrated are still found at their old path, so it can be run at any
+convenient time and re-run safely.
+"""
+import os
+import sys
+import logging
+import argparse
+
+from config import settings
+from utils.session_paths import sharded_session_dir, iter_session_dirs, legacy_session_dir
+
+logger = logging.getLogger("session_migrate")
+
+def migrate_sessions(root, dry_run=False):
+    """Move every legacy session directory under root into its shard"""
+    result = {"moved": 0, "skipped": 0, "failed": 0}
+    legacy = [
+        session_id for session_id, path in iter_session_dirs(root)
+        if path == legacy_session_dir(root, session_id)
+    ]
+    for session_id in legacy:
+        source = legacy_session_dir(root, session_id)
+        target = sharded_session_dir(root, session_id)
+        if os.path.exists(target):
+            logger.warning(f"Skipping {session_id}: {target} already exists")
+            result["skipped"] += 1
+            continue
+        if dry_run:
+            logger.info(f"Would move {source} -> {target}")
+            result["moved"] += 1
+            continue
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Same filesystem, so this is an atomic rename
+            os.rename(source, target)
+            result["moved"] += 1
+        except OSError as e:
+            logger.error(f"Failed to move {session_id}: {e}")
+            result["failed"] += 1
+
+    logger.info(f"{root}: moved {result['moved']}, skipped {result['skipped']}, failed {result['failed']}")
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shard legacy session directories")
+    parser.add_argument("--dir", action="append", dest="dirs", help="Sessions directory to migrate (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be moved")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    dirs = args.dirs or list(dict.fromkeys([settings.sessions_dir, settings.SESSION_DIR]))
+    failed = 0
+    for root in dirs:
+        failed += migrate_sessions(root, dry_run=args.dry_run)["failed"]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
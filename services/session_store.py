@@ -0,0 +1,434 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from config import settings
+from utils.session_log import session_logs, apply_event
+from utils.session_paths import session_dir, iter_session_dirs
+from services.session_index import SessionIndex
+
+logger = logging.getLogger(__name__)
+
+class SessionStore(ABC):
+    """
+    Persistence backend for interview sessions.
+    Sessions are created with a full snapshot and then changed through
+    small logged events (append to a list field, set a field).
+    """
+
+    # True if other processes may write the same sessions, so callers must not
+    # serve sessions from a process-local cache
+    shared = False
+
+    # SessionIndex with a summary row per session
+    index = None
+
+    @abstractmethod
+    def create(self, session):
+        """Persist a new session"""
+        raise NotImplementedError
+
+    def create_many(self, sessions):
+        """Persist several new sessions"""
+        for session in sessions:
+            self.create(session)
+
+    @abstractmethod
+    def load(self, session_id):
+        """Load a session dict, or None if it does not exist"""
+        raise NotImplementedError
+
+    def exists(self, session_id):
+        """Check whether a session exists"""
+        return self.load(session_id) is not None
+
+    @abstractmethod
+    def append(self, session, op, field, value):
+        """Record a change that has already been applied to the session dict"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, session):
+        """Write a full snapshot of a session"""
+        raise NotImplementedError
+
+    def list_ids(self):
+        """List the IDs of all stored sessions, oldest first"""
+        return self.index.list_ids()
+
+    def query(self, **kwargs):
+        """Get a page of session summaries; see SessionIndex.query"""
+        return self.index.query(**kwargs)
+
+    @abstractmethod
+    def rebuild_index(self):
+        """Rebuild the session index from the stored sessions"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Delete a session; returns False if it did not exist"""
+        raise NotImplementedError
+
+    def release(self, session_id):
+        """Free per-session resources once a session leaves the in-memory cache"""
+
+    def close(self):
+        """Release files and connections"""
+
+class FileSessionStore(SessionStore):
+    """Sessions as per-session directories holding a snapshot and an event log"""
+
+    def __init__(self, sessions_dir, index_path):
+        self.sessions_dir = sessions_dir
+        os.makedirs(sessions_dir, exist_ok=True)
+        self.index = SessionIndex(index_path)
+        if self.index.count() == 0 and self._scan_ids():
+            # First start with an index: pick up sessions created before it existed
+            self.rebuild_index()
+
+    def session_dir(self, session_id):
+        return session_dir(self.sessions_dir, session_id)
+
+    def _log(self, session_id):
+        return session_logs.get(self.session_dir(session_id))
+
+    def create(self, session):
+        self._log(session["session_id"]).create(session)
+        self.index.upsert(session)
+
+    def create_many(self, sessions):
+        for session in sessions:
+            self._log(session["session_id"]).create(session)
+        self.index.upsert_many(sessions)
+
+    def load(self, session_id):
+        session_log = self._log(session_id)
+        if not session_log.exists():
+            return None
+        return session_log.replay()
+
+    def exists(self, session_id):
+        return self._log(session_id).exists()
+
+    def append(self, session, op, field, value):
+        session_log = self._log(session["session_id"])
+        session_log.append(op, field, value)
+        if session_log.needs_compaction():
+            # Rebuild from disk rather than trusting the caller's copy
+            session_log.compact()
+        self.index.apply(session["session_id"], op, field, value)
+
+    def save(self, session):
+        session_log = self._log(session["session_id"])
+        if session_log.exists():
+            session_log.compact(session)
+        else:
+            session_log.create(session)
+        self.index.upsert(session)
+
+    def _scan_ids(self):
+        """Session IDs found on disk; slow, only used to rebuild the index"""
+        return [
+            session_id for session_id, path in iter_session_dirs(self.sessions_dir)
+            if session_logs.get(path).exists()
+        ]
+
+    def rebuild_index(self):
+        sessions = []
+        for session_id in self._scan_ids():
+            try:
+                sessions.append(self.load(session_id))
+            except Exception as e:
+                logger.error(f"Skipping unreadable session {session_id}: {e}")
+            finally:
+                session_logs.discard(self.session_dir(session_id))
+        return self.index.rebuild(sessions)
+
+    def delete(self, session_id):
+        session_dir = self.session_dir(session_id)
+        session_logs.discard(session_dir)
+        self.index.remove(session_id)
+        if not os.path.exists(session_dir):
+            return False
+        shutil.rmtree(session_dir)
+        return True
+
+    def release(self, session_id):
+        session_logs.discard(self.session_dir(session_id))
+
+    def close(self):
+        session_logs.close_all()
+        self.index.close()
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions in a SQLite database in WAL mode, so several worker processes on
+    one host can share them. Like the file store, each session is a snapshot
+    plus an event table that is folded back into the snapshot periodically.
+
+    save() only overwrites the snapshot if the caller's copy has seen every
+    logged event; otherwise the events are folded in as by compact(), so a
+    stale copy cannot wipe out changes made by another worker.
+    """
+
+    shared = True
+
+    # Sessions whose last seen event ID is remembered for save()
+    max_tracked_versions = 10000
+
+    _SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            snapshot TEXT NOT NULL,
+            last_event_id INTEGER NOT NULL DEFAULT 0,
+            pending_events INTEGER NOT NULL DEFAULT 0
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at)",
+        """CREATE TABLE IF NOT EXISTS session_events (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            ts REAL NOT NULL,
+            event TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_session_events_session ON session_events(session_id, event_id)",
+    ]
+
+    # Statements are reused verbatim so sqlite3's per-connection statement cache keeps them prepared
+    _INSERT_SESSION = (
+        "INSERT OR REPLACE INTO sessions (session_id, created_at, updated_at, snapshot, last_event_id, pending_events) "
+        "VALUES (?, ?, ?, ?, 0, 0)"
+    )
+    _SELECT_SESSION = "SELECT snapshot, last_event_id FROM sessions WHERE session_id = ?"
+    _SELECT_EVENTS = "SELECT event_id, event FROM session_events WHERE session_id = ? AND event_id > ? ORDER BY event_id"
+    _INSERT_EVENT = "INSERT INTO session_events (session_id, ts, event) VALUES (?, ?, ?)"
+    _BUMP_PENDING = "UPDATE sessions SET pending_events = pending_events + 1, updated_at = ? WHERE session_id = ?"
+    _SELECT_PENDING = "SELECT pending_events FROM sessions WHERE session_id = ?"
+    _UPDATE_SNAPSHOT = (
+        "UPDATE sessions SET snapshot = ?, last_event_id = ?, pending_events = 0, updated_at = ? WHERE session_id = ?"
+    )
+    _LATEST_EVENT = "SELECT MAX(event_id) FROM session_events WHERE session_id = ?"
+    _DELETE_EVENTS_UPTO = "DELETE FROM session_events WHERE session_id = ? AND event_id <= ?"
+    _DELETE_EVENTS = "DELETE FROM session_events WHERE session_id = ?"
+    _DELETE_SESSION = "DELETE FROM sessions WHERE session_id = ?"
+    _EXISTS = "SELECT 1 FROM sessions WHERE session_id = ?"
+    _EXISTS_ANY = "SELECT 1 FROM sessions LIMIT 1"
+    _ALL_IDS = "SELECT session_id FROM sessions"
+
+    def __init__(self, db_path, sessions_dir=None, compact_every=None):
+        self.db_path = db_path
+        self.sessions_dir = sessions_dir
+        self.compact_every = compact_every or settings.SESSION_LOG_COMPACT_EVERY
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()  # session_id -> last event ID this process has seen
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = self._conn()
+        with conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+
+        # Summary rows live in the same database
+        self.index = SessionIndex(db_path)
+        if self.index.count() == 0 and conn.execute(self._EXISTS_ANY).fetchone():
+            self.rebuild_index()
+
+    def _conn(self):
+        """One connection per thread; sqlite3 connections cannot be shared across threads"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None, cached_statements=64, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._conn())
+
+    def _seen(self, session_id, event_id):
+        """Remember the last event reflected in this process's copy of a session (None forgets it)"""
+        with self._lock:
+            if event_id is None:
+                self._versions.pop(session_id, None)
+                return
+            self._versions[session_id] = event_id
+            self._versions.move_to_end(session_id)
+            while len(self._versions) > self.max_tracked_versions:
+                self._versions.popitem(last=False)
+
+    def _latest_event_id(self, conn, session_id, snapshot_event_id):
+        latest = conn.execute(self._LATEST_EVENT, (session_id,)).fetchone()[0]
+        return max(latest or 0, snapshot_event_id)
+
+    def create(self, session):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(self._DELETE_EVENTS, (session["session_id"],))
+            conn.execute(self._INSERT_SESSION, (
+                session["session_id"],
+                session.get("created_at", now),
+                now,
+                json.dumps(session)
+            ))
+        self._seen(session["session_id"], 0)
+        self.index.upsert(session)
+
+    def create_many(self, sessions):
+        """Persist several new sessions in one transaction"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(self._DELETE_EVENTS, [(session["session_id"],) for session in sessions])
+            conn.executemany(self._INSERT_SESSION, [
+                (session["session_id"], session.get("created_at", now), now, json.dumps(session))
+                for session in sessions
+            ])
+        for session in sessions:
+            self._seen(session["session_id"], 0)
+        self.index.upsert_many(sessions)
+
+    def _replay(self, conn, session_id):
+        row = conn.execute(self._SELECT_SESSION, (session_id,)).fetchone()
+        if row is None:
+            return None, 0
+        session = json.loads(row[0])
+        last_event_id = row[1]
+        for event_id, event in conn.execute(self._SELECT_EVENTS, (session_id, row[1])):
+            session = apply_event(session, json.loads(event))
+            last_event_id = event_id
+        return session, last_event_id
+
+    def load(self, session_id):
+        session, last_event_id = self._replay(self._conn(), session_id)
+        self._seen(session_id, last_event_id if session is not None else None)
+        return session
+
+    def exists(self, session_id):
+        return self._conn().execute(self._EXISTS, (session_id,)).fetchone() is not None
+
+    def append(self, session, op, field, value):
+        session_id = session["session_id"]
+        event = {"ts": time.time(), "op": op, "field": field, "value": value}
+        with self._lock:
+            seen = self._versions.get(session_id)
+        with self._transaction() as conn:
+            row = conn.execute(self._SELECT_SESSION, (session_id,)).fetchone()
+            # The caller's copy stays current only if no other worker logged an event since
+            current = row is not None and seen == self._latest_event_id(conn, session_id, row[1])
+            event_id = conn.execute(self._INSERT_EVENT, (session_id, event["ts"], json.dumps(event))).lastrowid
+            conn.execute(self._BUMP_PENDING, (event["ts"], session_id))
+            row = conn.execute(self._SELECT_PENDING, (session_id,)).fetchone()
+        self._seen(session_id, event_id if current else None)
+        self.index.apply(session_id, op, field, value)
+        if row and row[0] >= self.compact_every:
+            self.compact(session_id)
+
+    def compact(self, session_id):
+        """Fold pending events into the snapshot"""
+        with self._transaction() as conn:
+            # Replay inside the write transaction so events from other workers are included
+            session, last_event_id = self._replay(conn, session_id)
+            if session is None:
+                return
+            conn.execute(self._UPDATE_SNAPSHOT, (json.dumps(session), last_event_id, time.time(), session_id))
+            conn.execute(self._DELETE_EVENTS_UPTO, (session_id, last_event_id))
+
+    def save(self, session):
+        session_id = session["session_id"]
+        with self._lock:
+            seen = self._versions.get(session_id)
+        with self._transaction() as conn:
+            row = conn.execute(self._SELECT_SESSION, (session_id,)).fetchone()
+            if row is None:
+                now = time.time()
+                conn.execute(self._INSERT_SESSION, (session_id, session.get("created_at", now), now, json.dumps(session)))
+                last_event_id = 0
+            else:
+                last_event_id = self._latest_event_id(conn, session_id, row[1])
+                if seen != last_event_id:
+                    # The caller's copy may be missing events; keep them and fold them in instead
+                    session, last_event_id = self._replay(conn, session_id)
+                    logger.warning(f"Session {session_id} changed since it was loaded; compacting instead of saving")
+                conn.execute(self._UPDATE_SNAPSHOT, (json.dumps(session), last_event_id, time.time(), session_id))
+                conn.execute(self._DELETE_EVENTS_UPTO, (session_id, last_event_id))
+        self._seen(session_id, last_event_id)
+        self.index.upsert(session)
+
+    def rebuild_index(self):
+        session_ids = [row[0] for row in self._conn().execute(self._ALL_IDS)]
+        return self.index.rebuild(self.load(session_id) for session_id in session_ids)
+
+    def delete(self, session_id):
+        with self._transaction() as conn:
+            conn.execute(self._DELETE_EVENTS, (session_id,))
+            deleted = conn.execute(self._DELETE_SESSION, (session_id,)).rowcount > 0
+        self._seen(session_id, None)
+        self.index.remove(session_id)
+        # Audio and uploads for the session still live on disk
+        if self.sessions_dir:
+            path = session_dir(self.sessions_dir, session_id)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+        return deleted
+
+    def release(self, session_id):
+        self._seen(session_id, None)
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+        self.index.close()
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK on an autocommit connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+def create_session_store(backend=None):
+    """Build the session store selected by settings.SESSION_STORE"""
+    backend = (backend or settings.SESSION_STORE).lower()
+    sessions_dir = settings.sessions_dir
+    if backend == "sqlite":
+        logger.info(f"Using SQLite session store at {settings.SESSION_DB_PATH}")
+        return SqliteSessionStore(settings.SESSION_DB_PATH, sessions_dir=sessions_dir)
+    if backend != "file":
+        logger.warning(f"Unknown session store '{backend}', using the file store")
+    return FileSessionStore(sessions_dir, settings.SESSION_INDEX_PATH)
+
+# Shared session store
+session_store = create_session_store()
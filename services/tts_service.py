@@ -0,0 +1,106 @@
+import re
+import asyncio
+import logging
+from google.cloud import texttospeech
+
+from config import settings
+from utils.audio_cache import audio_cache
+from utils.audio_store import audio_store
+from utils.async_executor import tts_executor
+from utils.single_flight import tts_flight
+
+logger = logging.getLogger(__name__)
+
+# Voice used for interview question audio
+QUESTION_LANGUAGE_CODE = "en-US"
+QUESTION_VOICE_ID = "en-US-NEUTRAL"  # Cache key identifier for the gender-selected default voice
+QUESTION_ENCODING = "MP3"
+
+def question_audio_key(text):
+    """Cache key for the audio of an interview question"""
+    return audio_cache.make_key(text, QUESTION_VOICE_ID, 1.0, 0.0, QUESTION_ENCODING)
+
+def synthesize_question_audio(client, text):
+    """
+    Get MP3 audio for an interview question.
+    Returns (audio bytes, cache key); pre-rendered or cached audio is used when available.
+    """
+    key = question_audio_key(text)
+    audio = audio_store.get(key)
+    if audio is None:
+        audio = audio_cache.get(key)
+    if audio is not None:
+        return audio, key
+
+    # Sessions reaching the same question together share one synthesis
+    audio = tts_flight.do(key, render_question_audio, client, text)
+    audio_cache.put(key, audio)
+    return audio, key
+
+def render_question_audio(client, text):
+    """Synthesize MP3 audio for an interview question without any caching"""
+    text_input = texttospeech.SynthesisInput(text=text)
+    voice = texttospeech.VoiceSelectionParams(
+        language_code=QUESTION_LANGUAGE_CODE,
+        ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
+    )
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3
+    )
+    response = client.synthesize_speech(
+        input=text_input,
+        voice=voice,
+        audio_config=audio_config
+    )
+    return response.audio_content
+
+# Sentence ends followed by whitespace, and softer break points for long sentences
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;:])\s+|\n+')
+_CLAUSE_BOUNDARY = re.compile(r'(?<=[,])\s+|\s+')
+
+def split_text_into_chunks(text, max_chars=None):
+    """
+    Split text into sentence-aligned chunks of at most max_chars characters.
+    The first sentence is always its own chunk so playback can start early;
+    later short sentences are merged to keep the number of RPCs down.
+    """
+    max_chars = max_chars or settings.TTS_STREAM_CHUNK_CHARS
+    sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+    pieces = []
+    for sentence in sentences:
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        # Break overly long sentences at commas or spaces
+        current = ""
+        for part in _CLAUSE_BOUNDARY.split(sentence):
+            if current and len(current) + len(part) + 1 > max_chars:
+                pieces.append(current)
+                current = part
+            else:
+                current = f"{current} {part}" if current else part
+        if current:
+            pieces.append(current)
+
+    chunks = []
+    for piece in pieces:
+        if len(chunks) > 1 and len(chunks[-1]) + len(piece) + 1 <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+async def synthesize_chunks_in_order(synthesize, chunks):
+    """
+    Synthesize all chunks concurrently on the TTS executor and yield the
+    audio for each chunk in its original order as soon as it is ready.
+    """
+    tasks = [asyncio.ensure_future(tts_executor.run(synthesize, chunk)) for chunk in chunks]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        # Client went away or a chunk failed, drop the remaining work
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,173 @@
+import asyncio
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from config import settings
+from utils.single_flight import llm_flight
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class BlockingExecutor:
+    """Run blocking SDK calls off the event loop on a bounded thread pool"""
+
+    def __init__(self, name, max_workers, max_concurrency=None):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_concurrency = max(1, int(max_concurrency or max_workers))
+
+        self._executor = None
+        self._lock = threading.Lock()
+        # asyncio primitives are bound to a loop, so keep one semaphore per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        # Counters
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self):
+        """Create the thread pool on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"{self.name}-worker"
+                    )
+                    logger.info(f"Started {self.name} executor with {self.max_workers} workers")
+        return self._executor
+
+    def _get_semaphore(self):
+        """Get the concurrency limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """Await a blocking callable, waiting for a free slot if the limit is reached"""
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        # The slot is released when the worker finishes, not when the awaiting
+        # task goes away: cancelling a run cannot stop a call already running
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        self.in_flight += 1
+        future.add_done_callback(lambda f: self._release_threadsafe(loop, semaphore, f))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release_threadsafe(self, loop, semaphore, future):
+        try:
+            loop.call_soon_threadsafe(self._release, semaphore, future)
+        except RuntimeError:
+            # The loop is closed, and its semaphore with it
+            pass
+
+    def _release(self, semaphore, future):
+        self.in_flight -= 1
+        self.completed += 1
+        if not future.cancelled() and future.exception() is not None:
+            self.failed += 1
+        semaphore.release()
+
+    async def iterate(self, func, *args, **kwargs):
+        """
+        Async-iterate a blocking generator, which runs on the pool and holds
+        one slot until it is exhausted. Items are handed to the event loop as
+        they are produced; if the consumer stops early the generator is
+        closed at its next item.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stopped = threading.Event()
+        done = object()
+
+        def produce():
+            iterator = iter(func(*args, **kwargs))
+            try:
+                for item in iterator:
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+                raise
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+
+        task = asyncio.ensure_future(self.run(produce))
+        try:
+            while True:
+                item, error = await queue.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    break
+                yield item
+            await task
+        finally:
+            stopped.set()
+            # The worker may still be finishing; consume its result when it does
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def get_status(self):
+        """Get executor load and counters"""
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    def shutdown(self, wait=False):
+        """Stop the thread pool; it is recreated on the next call"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+# Shared executor for Gemini calls
+llm_executor = BlockingExecutor(
+    "llm",
+    max_workers=settings.LLM_MAX_WORKERS,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY
+)
+
+# Shared executor for Text-to-Speech calls
+tts_executor = BlockingExecutor(
+    "tts",
+    max_workers=settings.TTS_MAX_WORKERS,
+    max_concurrency=settings.TTS_MAX_CONCURRENCY
+)
+
+async def generate_content_async(model, *args, **kwargs):
+    """
+    Call ``model.generate_content`` on the LLM executor.
+    Identical calls already in flight are joined instead of repeated; calls
+    only match on the same model name and generation config.
+    """
+    from utils.google_cloud import cloud_manager
+
+    key = llm_flight.make_key(cloud_manager.model_key(model), args, kwargs)
+    return await llm_flight.do_async(key, llm_executor.run, model.generate_content, *args, **kwargs)
@@ -0,0 +1,198 @@
+import os
+import time
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class AudioCache:
+    """
+    Content-addressed cache for synthesized speech.
+    Entries live in a bounded in-memory LRU backed by a bounded directory on
+    disk, both evicting least recently used audio first. Entries older than
+    the TTL are treated as missing.
+    """
+
+    def __init__(self, cache_dir, max_memory_bytes, max_disk_bytes, ttl, enabled=True):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+
+        self._memory = OrderedDict()  # key -> (audio, created_at)
+        self._memory_bytes = 0
+        self._disk = None             # key -> (size, created_at), loaded lazily
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text, voice, speaking_rate=1.0, pitch=0.0, encoding="MP3"):
+        """Hash the synthesis parameters into a cache key"""
+        payload = json.dumps(
+            [text, voice, float(speaking_rate), float(pitch), str(encoding)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.audio")
+
+    def _is_expired(self, created_at):
+        return self.ttl > 0 and time.time() - created_at > self.ttl
+
+    def _load_disk_index(self):
+        """Scan the cache directory once, oldest files first"""
+        if self._disk is not None:
+            return
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".audio"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+
+        for mtime, key, size in sorted(entries):
+            self._disk[key] = (size, mtime)
+            self._disk_bytes += size
+
+    def get(self, key):
+        """Get cached audio bytes, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                audio, created_at = entry
+                if not self._is_expired(created_at):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return audio
+                self._drop_memory(key)
+
+            self._load_disk_index()
+            disk_entry = self._disk.get(key)
+            if disk_entry is not None:
+                size, created_at = disk_entry
+                if self._is_expired(created_at):
+                    self._drop_disk(key)
+                else:
+                    try:
+                        with open(self._path(key), "rb") as f:
+                            audio = f.read()
+                    except OSError:
+                        self._drop_disk(key)
+                    else:
+                        self._disk.move_to_end(key)
+                        self._store_memory(key, audio, created_at)
+                        self.disk_hits += 1
+                        return audio
+
+            self.misses += 1
+            return None
+
+    def put(self, key, audio):
+        """Store audio bytes in memory and on disk"""
+        if not self.enabled or not audio:
+            return
+
+        created_at = time.time()
+        with self._lock:
+            self._store_memory(key, audio, created_at)
+
+            self._load_disk_index()
+            try:
+                # Write to a temp file first so readers never see partial audio
+                tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                logger.error(f"Error writing audio cache entry {key}: {e}")
+                return
+
+            if key in self._disk:
+                self._disk_bytes -= self._disk.pop(key)[0]
+            self._disk[key] = (len(audio), created_at)
+            self._disk_bytes += len(audio)
+            self._evict_disk()
+
+    def _store_memory(self, key, audio, created_at):
+        if len(audio) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._drop_memory(key)
+        self._memory[key] = (audio, created_at)
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+
+    def _drop_memory(self, key):
+        audio, _ = self._memory.pop(key)
+        self._memory_bytes -= len(audio)
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            oldest = next(iter(self._disk))
+            self._drop_disk(oldest)
+
+    def _drop_disk(self, key):
+        size, _ = self._disk.pop(key)
+        self._disk_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove all cached audio"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._load_disk_index()
+            for key in list(self._disk):
+                self._drop_disk(key)
+
+    def get_stats(self):
+        """Get cache size and hit counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk) if self._disk is not None else None,
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+# Shared cache for synthesized speech
+audio_cache = AudioCache(
+    cache_dir=settings.AUDIO_CACHE_DIR,
+    max_memory_bytes=settings.AUDIO_CACHE_MEMORY_MB * 1024 * 1024,
+    max_disk_bytes=settings.AUDIO_CACHE_DISK_MB * 1024 * 1024,
+    ttl=settings.CACHE_TTL,
+    enabled=settings.ENABLE_CACHING
+)
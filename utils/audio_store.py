@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import logging
+import threading
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class AudioStore:
+    """
+    Persistent store of pre-rendered audio.
+    Each store version lives in its own directory with a manifest mapping
+    audio cache keys to files, so a new voice or format can be rendered into
+    a fresh version without disturbing the one being served.
+    """
+
+    def __init__(self, root, version):
+        self.root = root
+        self.version = version
+        self.directory = os.path.join(root, version)
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+
+        self._entries = {}
+        self._manifest_mtime = None
+        self._lock = threading.Lock()
+
+    def _reload_if_changed(self):
+        """Pick up manifest changes written by the pre-rendering job"""
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+            self._entries = manifest.get("entries", {})
+            self._manifest_mtime = mtime
+        except Exception as e:
+            logger.error(f"Error loading audio store manifest {self.manifest_path}: {e}")
+
+    def has(self, key):
+        """Check whether audio for a key has been rendered"""
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+        return entry is not None and os.path.exists(os.path.join(self.directory, entry["file"]))
+
+    def get(self, key):
+        """Get pre-rendered audio bytes, or None"""
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def keys(self):
+        """Keys present in the manifest"""
+        with self._lock:
+            self._reload_if_changed()
+            return set(self._entries)
+
+    def put(self, key, text, audio, extension="mp3"):
+        """Write audio for a key; call save_manifest() to publish it"""
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"{key}.{extension}"
+        path = os.path.join(self.directory, filename)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._entries[key] = {
+                "file": filename,
+                "text": text,
+                "size": len(audio),
+                "rendered_at": time.time()
+            }
+
+    def remove(self, key):
+        """Drop a key and its audio file"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry:
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except OSError:
+                pass
+
+    def save_manifest(self):
+        """Atomically write the manifest"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            manifest = {
+                "version": self.version,
+                "updated_at": time.time(),
+                "entries": self._entries
+            }
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+            self._manifest_mtime = os.path.getmtime(self.manifest_path)
+
+    def get_stats(self):
+        """Get store size"""
+        with self._lock:
+            self._reload_if_changed()
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "bytes": sum(e.get("size", 0) for e in self._entries.values())
+            }
+
+# Shared store of pre-rendered question audio
+audio_store = AudioStore(settings.AUDIO_STORE_DIR, settings.AUDIO_STORE_VERSION)
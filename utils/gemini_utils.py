@@ -1,6 +1,9 @@
 import google.generativeai as genai
 from google.cloud import aiplatform
 from config import settings
+from utils.google_cloud import cloud_manager
+from utils.llm_cache import llm_cache
+from utils.single_flight import llm_flight
 import json
 
 # Initialize the services
@@ -10,44 +13,74 @@ genai.configure(api_key=settings.API_KEY)
 # Default model names
 DEFAULT_MODEL = 'gemini-1.5-pro-latest'
 
+# generate_content returns errors as text starting with this prefix
+GENERATION_ERROR_PREFIX = "Content generation error:"
+
 def get_gemini_model(model_name=None):
-    """Get a Gemini generative model"""
+    """Get a Gemini generative model from the shared model registry"""
     model_name = model_name or settings.generative_model_name or DEFAULT_MODEL
-    return genai.GenerativeModel(model_name)
+    model = cloud_manager.get_genai_model(model_name)
+    if model is None:
+        # Gemini not initialized by the cloud manager, use this module's configuration
+        model = genai.GenerativeModel(model_name)
+    return model
+
+def _generation_request(prompt, temperature, system_instruction):
+    """Keyword arguments for model.generate_content"""
+    generation_config = {
+        "temperature": temperature,
+        "top_p": 0.95,
+        "top_k": 40,
+        "max_output_tokens": 8192,
+    }
+    
+    # Use the chat format which allows for system instructions
+    if system_instruction:
+        contents = [
+            {"role": "system", "parts": [system_instruction]},
+            {"role": "user", "parts": [prompt]}
+        ]
+    else:
+        contents = prompt
+    return {"contents": contents, "generation_config": generation_config}
 
-def generate_content(prompt, model_name=None, temperature=0.7, system_instruction=None):
-    """Generate content using Gemini with enhanced controls"""
+def generate_content(prompt, model_name=None, temperature=0.7, system_instruction=None, cache=False):
+    """
+    Generate content using Gemini with enhanced controls.
+    With cache=True the response is served from and stored in the LLM cache;
+    use it only where the same input should give the same answer. Identical
+    calls already in flight are joined instead of repeated.
+    """
     try:
+        model_name = model_name or settings.generative_model_name or DEFAULT_MODEL
         model = get_gemini_model(model_name)
+        request = _generation_request(prompt, temperature, system_instruction)
         
-        generation_config = {
-            "temperature": temperature,
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 8192,
-        }
-        
-        # Use the chat format which allows for system instructions
-        if system_instruction:
-            response = model.generate_content(
-                contents=[
-                    {"role": "system", "parts": [system_instruction]},
-                    {"role": "user", "parts": [prompt]}
-                ],
-                generation_config=generation_config
-            )
-        else:
-            response = model.generate_content(
-                contents=prompt,
-                generation_config=generation_config
-            )
+        def call():
+            response = model.generate_content(**request)
+            if hasattr(response, 'text'):
+                return response.text
+            return str(response)
         
-        if hasattr(response, 'text'):
-            return response.text
-        return str(response)
+        key = llm_cache.make_key(model_name, system_instruction, prompt, request["generation_config"])
+        if cache:
+            return llm_flight.do(key, llm_cache.call, key, call)
+        return llm_flight.do(key, call)
     except Exception as e:
         print(f"Error generating content: {e}")
-        return f"Content generation error: {str(e)}"
+        return f"{GENERATION_ERROR_PREFIX} {str(e)}"
+
+def stream_content(prompt, model_name=None, temperature=0.7, system_instruction=None):
+    """
+    Like generate_content, but yields text chunks as Gemini produces them.
+    Blocking; errors are raised rather than returned as text.
+    """
+    model = get_gemini_model(model_name)
+    response = model.generate_content(stream=True, **_generation_request(prompt, temperature, system_instruction))
+    for chunk in response:
+        text = getattr(chunk, "text", None)
+        if text:
+            yield text
 
 def analyze_sentiment_with_gemini(text):
     """Analyze sentiment using Gemini with structured output"""
@@ -75,7 +108,7 @@ def analyze_sentiment_with_gemini(text):
     """
     
     try:
-        response = generate_content(prompt, temperature=0.1, system_instruction=system_instruction)
+        response = generate_content(prompt, temperature=0.1, system_instruction=system_instruction, cache=True)
         # Clean the response to ensure it's valid JSON
         response = response.strip()
         if response.startswith('```json'):
@@ -151,6 +184,15 @@ def generate_feedback_with_examples(transcript, is_detailed=False):
         print(f"Error generating feedback: {e}")
         return "We couldn't generate detailed feedback at this time. Please try again later."
 
+# Generic questions used when CV question generation fails
+CV_FALLBACK_QUESTIONS = [
+    "Based on your experience, what key metrics did you track to measure success?",
+    "How would you apply your background to build a scalable startup?",
+    "What's the biggest market opportunity you've identified from your work so far?",
+    "How does your experience give you unique insights for this venture?",
+    "What specific challenges from your past roles are you best equipped to handle as a founder?"
+]
+
 def generate_cv_questions_enhanced(cv_text):
     """Generate personalized interview questions based on CV with advanced prompting"""
     system_instruction = """
@@ -200,10 +242,4 @@ def generate_cv_questions_enhanced(cv_text):
         return clean_questions[:5]  # Return up to 5 questions
     except Exception as e:
         print(f"Error generating CV questions: {e}")
-        return [
-            "Based on your experience, what key metrics did you track to measure success?",
-            "How would you apply your background to build a scalable startup?",
-            "What's the biggest market opportunity you've identified from your work so far?",
-            "How does your experience give you unique insights for this venture?",
-            "What specific challenges from your past roles are you best equipped to handle as a founder?"
-        ]
+        return list(CV_FALLBACK_QUESTIONS)
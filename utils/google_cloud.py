@@ -1,5 +1,7 @@
 import os
+import json
 import logging
+import threading
 from dotenv import load_dotenv
 import google.generativeai as genai
 from google.cloud import texttospeech, speech, aiplatform
@@ -16,12 +18,21 @@ class GoogleCloudManager:
         self.project_id = os.getenv("PROJECT_ID", "vc-interview-agent")
         self.location = os.getenv("LOCATION", "us-central1")
         self.credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        self.default_model_name = os.getenv("GENERATIVE_MODEL_NAME", "gemini-1.5-pro-latest")
         
         # Clients
         self.genai_client = None
         self.tts_client = None
         self.speech_client = None
         self.vertex_client = None
+        self._clients_lock = threading.Lock()
+        
+        # Gemini model registry keyed by (model name, generation config)
+        self._models = {}
+        self._model_keys = {}   # id(model) -> registry key
+        self._models_lock = threading.Lock()
+        self.model_cache_hits = 0
+        self.model_cache_misses = 0
         
         # Status
         self.initialized = False
@@ -99,12 +110,83 @@ class GoogleCloudManager:
                 "tts": self.tts_client is not None,
                 "stt": self.speech_client is not None,
                 "vertex_ai": self.vertex_client is not None
-            }
+            },
+            "model_cache": self.get_model_cache_stats()
         }
     
     def is_initialized(self):
         """Check if manager is initialized"""
         return self.initialized
+    
+    def get_tts_client(self):
+        """Get the shared Text-to-Speech client, creating it if initialization skipped it"""
+        if self.tts_client is None:
+            with self._clients_lock:
+                if self.tts_client is None:
+                    self.tts_client = texttospeech.TextToSpeechClient()
+                    logger.info("Text-to-Speech client initialized")
+        return self.tts_client
+    
+    def get_genai_model(self, model_name=None, generation_config=None):
+        """
+        Get a Gemini model from the process-wide registry.
+        Models are built once per configuration and reused, so they share the
+        SDK's default transport instead of setting up a new one per request.
+        The pinned SDK has no model-level system instruction; callers send it
+        with the request contents instead (see gemini_utils).
+        Returns None if Gemini is not available.
+        """
+        if self.genai_client is None:
+            return None
+        
+        model_name = model_name or self.default_model_name
+        key = (model_name, _freeze_config(generation_config))
+        
+        model = self._models.get(key)
+        if model is not None:
+            self.model_cache_hits += 1
+            return model
+        
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is not None:
+                self.model_cache_hits += 1
+                return model
+            
+            kwargs = {}
+            if generation_config:
+                kwargs["generation_config"] = generation_config
+            
+            model = self.genai_client.GenerativeModel(model_name, **kwargs)
+            self._models[key] = model
+            self._model_keys[id(model)] = key
+            self.model_cache_misses += 1
+            logger.info(f"Created Gemini model {model_name} ({len(self._models)} cached)")
+            return model
+    
+    def model_key(self, model):
+        """Registry key of a model: (model name, frozen generation config), also for models built elsewhere"""
+        key = self._model_keys.get(id(model))
+        if key is not None and self._models.get(key) is model:
+            return key
+        name = getattr(model, "model_name", None) or getattr(model, "_model_name", None) or repr(model)
+        return (name, _freeze_config(getattr(model, "_generation_config", None)))
+
+    def get_model_cache_stats(self):
+        """Get hit/miss counters for the model registry"""
+        total = self.model_cache_hits + self.model_cache_misses
+        return {
+            "size": len(self._models),
+            "hits": self.model_cache_hits,
+            "misses": self.model_cache_misses,
+            "hit_rate": self.model_cache_hits / total if total else 0.0
+        }
+    
+    def clear_model_cache(self):
+        """Drop all cached models, e.g. after reconfiguring the API key"""
+        with self._models_lock:
+            self._models.clear()
+            self._model_keys.clear()
 
     def init_tts(self):
         try:
@@ -147,6 +229,14 @@ class GoogleCloudManager:
             self._services_status['tts'] = False
             return False
 
+def _freeze_config(config):
+    """Turn a generation config into a hashable cache key component"""
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return json.dumps(config, sort_keys=True, default=str)
+    return repr(config)
+
 # Create an instance for global use
 cloud_manager = GoogleCloudManager()
 
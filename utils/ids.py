@@ -0,0 +1,63 @@
+import os
+import time
+import threading
+
+# Crockford base32, as used by ULIDs (no I, L, O or U)
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        chars.append(ULID_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+class UlidGenerator:
+    """
+    Generates ULIDs: a 48-bit millisecond timestamp followed by 80 random
+    bits, encoded as 26 Crockford base32 characters. IDs sort in creation
+    order, and IDs created in the same millisecond increment the random part
+    so they stay unique and ordered within a process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def new(self):
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms <= self._last_ms:
+                # Same millisecond (or the clock stepped back): stay monotonic
+                now_ms = self._last_ms
+                random_part = self._last_random + 1
+                if random_part > _RANDOM_MAX:
+                    now_ms += 1
+                    random_part = int.from_bytes(os.urandom(10), "big")
+            else:
+                random_part = int.from_bytes(os.urandom(10), "big")
+            self._last_ms = now_ms
+            self._last_random = random_part
+        return _encode(now_ms, 10) + _encode(random_part, 16)
+
+_generator = UlidGenerator()
+
+def new_ulid():
+    """Get a new unique, time-ordered ULID string"""
+    return _generator.new()
+
+def ulid_timestamp(ulid):
+    """Creation time of a ULID in seconds since the epoch"""
+    value = 0
+    for char in ulid[:10].upper():
+        value = value * 32 + ULID_ALPHABET.index(char)
+    return value / 1000.0
+
+def new_session_id():
+    """Get a new session ID; IDs sort by creation time"""
+    return f"session_{new_ulid()}"
@@ -0,0 +1,225 @@
+import os
+import time
+import json
+import hashlib
+import sqlite3
+import logging
+import threading
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Disk-backed cache of Gemini responses for calls whose output is
+    effectively deterministic for a given input. Entries are keyed by a
+    hash of the model, system instruction, prompt and generation config,
+    expire after a TTL, and the least recently used are evicted once the
+    cache grows past max_bytes. Call sites opt in; nothing is cached
+    implicitly.
+
+    The cache size is tracked as a running estimate: it is measured once,
+    grown by each write, and only re-measured (with expired and least
+    recently used entries evicted) when the estimate passes max_bytes.
+    """
+
+    _SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            latency REAL NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            expires_at REAL,
+            last_used REAL NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)",
+    ]
+
+    def __init__(self, db_path, max_bytes, ttl, enabled=True):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._ready = False
+        self._size = None   # Estimated bytes stored; None until first measured
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+
+    def _conn(self):
+        """Per-thread connection; the database is created on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock:
+                if not self._ready:
+                    db_dir = os.path.dirname(self.db_path)
+                    if db_dir:
+                        os.makedirs(db_dir, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                if not self._ready:
+                    for statement in self._SCHEMA:
+                        conn.execute(statement)
+                    self._ready = True
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model, system_instruction, prompt, generation_config=None):
+        """Hash everything that determines a response into a cache key"""
+        payload = json.dumps(
+            [str(model), system_instruction, prompt, generation_config or {}],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Cached response text, or None on a miss"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT response, latency, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[2] is not None and row[2] <= now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.error(f"Error reading LLM cache entry {key[:12]}: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.seconds_saved += row[1]
+        return row[0]
+
+    def put(self, key, response, latency=0.0, ttl=None):
+        """Store a response; latency is what a later hit saves"""
+        if not self.enabled or not response:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, latency, created_at, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response, size, latency, now, now + ttl if ttl > 0 else None, now)
+            )
+            self.writes += 1
+            # Replaced entries and other processes' writes make this an estimate;
+            # _evict measures the real size before deleting anything
+            with self._lock:
+                if self._size is None:
+                    self._size = self._total_size(conn)
+                else:
+                    self._size += size
+                over = self._size > self.max_bytes
+            if over:
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing LLM cache entry {key[:12]}: {e}")
+
+    @staticmethod
+    def _total_size(conn):
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        self.evictions += conn.execute(
+            "DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        total = self._total_size(conn)
+        if total <= self.max_bytes:
+            with self._lock:
+                self._size = total
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+        with self._lock:
+            self._size = total - freed
+
+    def call(self, key, func, ttl=None):
+        """Return the cached response for key, or call func() and cache its text"""
+        response = self.get(key)
+        if response is not None:
+            return response
+        started = time.time()
+        response = func()
+        self.put(key, response, time.time() - started, ttl)
+        return response
+
+    def clear(self):
+        """Remove all cached responses"""
+        self._conn().execute("DELETE FROM llm_cache")
+        with self._lock:
+            self._size = 0
+
+    def get_stats(self):
+        """Get cache size, hit counters and the Gemini time saved by hits"""
+        entries, size = 0, 0
+        if self.enabled:
+            try:
+                entries, size = self._conn().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading LLM cache stats: {e}")
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "seconds_saved": round(self.seconds_saved, 3)
+        }
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+# Shared cache for deterministic Gemini calls
+llm_cache = LLMCache(
+    db_path=settings.LLM_CACHE_PATH,
+    max_bytes=settings.LLM_CACHE_MAX_MB * 1024 * 1024,
+    ttl=settings.LLM_CACHE_TTL,
+    enabled=settings.ENABLE_CACHING
+)
@@ -0,0 +1,155 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class SessionCache:
+    """
+    Bounded in-memory cache of session dicts.
+    Sessions are evicted least recently used first once max_entries is
+    reached, and after idle_ttl seconds without access. Sessions marked
+    dirty are handed to on_evict when they leave the cache (or on flush) so
+    they can be written back to the session store.
+    """
+
+    def __init__(self, max_entries=1000, idle_ttl=1800, on_evict=None):
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+
+        self._entries = OrderedDict()  # session_id -> [session, last_access, dirty]
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.write_backs = 0
+
+    def get(self, session_id, default=None):
+        """Get a cached session and refresh its position"""
+        evicted = []
+        with self._lock:
+            evicted.extend(self._expire())
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                session = default
+            else:
+                entry[1] = time.time()
+                self._entries.move_to_end(session_id)
+                self.hits += 1
+                session = entry[0]
+        self._write_back(evicted)
+        return session
+
+    def put(self, session_id, session, dirty=False):
+        """Add or replace a cached session"""
+        evicted = []
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            dirty = dirty or (entry is not None and entry[2])
+            self._entries[session_id] = [session, time.time(), dirty]
+            evicted.extend(self._expire())
+            while len(self._entries) > self.max_entries:
+                evicted_id, evicted_entry = self._entries.popitem(last=False)
+                self.evictions += 1
+                evicted.append((evicted_id, evicted_entry))
+        self._write_back(evicted)
+
+    def mark_dirty(self, session_id):
+        """Flag a cached session as having changes to write back"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry[2] = True
+
+    def pop(self, session_id, default=None):
+        """Remove a session without writing it back"""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+        return entry[0] if entry is not None else default
+
+    def flush(self):
+        """Write back every dirty session, keeping them cached"""
+        with self._lock:
+            dirty = []
+            for session_id, entry in self._entries.items():
+                if entry[2]:
+                    dirty.append((session_id, (entry[0], entry[1], True)))
+                    entry[2] = False
+        self._write_back(dirty)
+
+    def evict_expired(self):
+        """Drop sessions idle for longer than the TTL"""
+        with self._lock:
+            evicted = self._expire()
+        self._write_back(evicted)
+
+    def _expire(self):
+        """Pop idle entries from the LRU end; the lock must be held"""
+        evicted = []
+        if not self.idle_ttl:
+            return evicted
+        cutoff = time.time() - self.idle_ttl
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if entry[1] >= cutoff:
+                break
+            self._entries.popitem(last=False)
+            self.expirations += 1
+            evicted.append((session_id, entry))
+        return evicted
+
+    def _write_back(self, evicted):
+        if not self.on_evict:
+            return
+        for session_id, (session, _, dirty) in evicted:
+            try:
+                self.on_evict(session_id, session, dirty)
+                if dirty:
+                    self.write_backs += 1
+            except Exception as e:
+                logger.error(f"Error writing back session {session_id}: {e}")
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._entries
+
+    def __getitem__(self, session_id):
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __setitem__(self, session_id, session):
+        self.put(session_id, session)
+
+    def __delitem__(self, session_id):
+        with self._lock:
+            del self._entries[session_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        """Get cache size and hit-rate metrics"""
+        lookups = self.hits + self.misses
+        with self._lock:
+            dirty = sum(1 for entry in self._entries.values() if entry[2])
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "idle_ttl": self.idle_ttl,
+            "dirty": dirty,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "write_backs": self.write_backs
+        }
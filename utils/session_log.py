@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+def apply_event(state, event):
+    """Apply one logged event to a session state dict and return the new state"""
+    op = event.get("op")
+    if op == "create":
+        return dict(event["value"])
+    if state is None:
+        return None
+    # Logs written before "value" was always stored omit it for None
+    if op == "append":
+        state.setdefault(event["field"], []).append(event.get("value"))
+    elif op == "set":
+        state[event["field"]] = event.get("value")
+    elif op == "update":
+        state.update(event["value"])
+    elif op == "delete":
+        state.pop(event["field"], None)
+    else:
+        logger.warning(f"Ignoring unknown session event op: {op}")
+    return state
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file, fsync it and rename it over the target"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class SessionEventLog:
+    """
+    Append-only event log for one session.
+    State is a JSON snapshot ({name}.json) plus the events appended since
+    ({name}.events.jsonl). Appends are flushed on every write and fsynced in
+    batches; once enough events pile up they are compacted into a new
+    snapshot. Every event carries a sequence number and the snapshot records
+    the last one it includes, so a crash during compaction never applies an
+    event twice, and a torn final line is dropped on replay.
+    """
+
+    def __init__(self, directory, name="session", fsync_every=None, fsync_interval=None, compact_every=None):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, f"{name}.json")
+        self.events_path = os.path.join(directory, f"{name}.events.jsonl")
+        self.fsync_every = fsync_every or settings.SESSION_LOG_FSYNC_EVERY
+        self.fsync_interval = fsync_interval if fsync_interval is not None else settings.SESSION_LOG_FSYNC_INTERVAL
+        self.compact_every = compact_every or settings.SESSION_LOG_COMPACT_EVERY
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._seq = None             # last sequence number written, loaded lazily
+        self._events_since_snapshot = 0
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def exists(self):
+        """Check whether the session has been persisted"""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.events_path)
+
+    def create(self, state):
+        """Start the log with an initial snapshot, discarding any previous events"""
+        with self._lock:
+            self._close_file()
+            os.makedirs(self.directory, exist_ok=True)
+            write_json_atomic(self.snapshot_path, dict(state, _last_seq=0))
+            if os.path.exists(self.events_path):
+                os.remove(self.events_path)
+            self._seq = 0
+            self._events_since_snapshot = 0
+
+    def append(self, op, field=None, value=None):
+        """Append an event to the log"""
+        with self._lock:
+            if self._seq is None:
+                self.replay()
+            self._seq += 1
+            event = {"seq": self._seq, "ts": time.time(), "op": op}
+            if field is not None:
+                event["field"] = field
+            # Always written: None is a valid value for "set" and "append"
+            event["value"] = value
+
+            f = self._get_file()
+            f.write(json.dumps(event) + "\n")
+            f.flush()
+            self._unsynced += 1
+            self._events_since_snapshot += 1
+
+            if self._unsynced >= self.fsync_every or time.time() - self._last_sync >= self.fsync_interval:
+                self.sync()
+            return event
+
+    def sync(self):
+        """fsync appended events to disk"""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = time.time()
+
+    def needs_compaction(self):
+        """Check whether enough events have accumulated to snapshot"""
+        return self._events_since_snapshot >= self.compact_every
+
+    def compact(self, state=None):
+        """Fold the events into a new snapshot and truncate the log"""
+        with self._lock:
+            if state is None:
+                state = self.replay()
+                if state is None:
+                    return
+            elif self._seq is None:
+                self.replay()
+            self.sync()
+            write_json_atomic(self.snapshot_path, dict(state, _last_seq=self._seq))
+            self._close_file()
+            # The snapshot already covers these events; a crash before this is harmless
+            open(self.events_path, "w").close()
+            self._events_since_snapshot = 0
+
+    def replay(self):
+        """Rebuild the session state from the snapshot and event log; None if missing"""
+        with self._lock:
+            state = None
+            last_seq = 0
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, "r") as f:
+                    state = json.load(f)
+                last_seq = state.pop("_last_seq", 0)
+
+            seq = last_seq
+            replayed = 0
+            if os.path.exists(self.events_path):
+                valid_size = 0
+                with open(self.events_path, "rb") as f:
+                    for line in f:
+                        try:
+                            event = json.loads(line)
+                        except ValueError:
+                            # Torn write from a crash; everything after it is dropped
+                            logger.warning(f"Truncating corrupt session log tail in {self.events_path}")
+                            break
+                        valid_size += len(line)
+                        if event.get("seq", 0) <= last_seq:
+                            continue
+                        state = apply_event(state, event)
+                        seq = event["seq"]
+                        replayed += 1
+                if valid_size < os.path.getsize(self.events_path):
+                    self._close_file()
+                    with open(self.events_path, "r+b") as f:
+                        f.truncate(valid_size)
+
+            self._seq = seq
+            self._events_since_snapshot = replayed
+            return state
+
+    def close(self):
+        """Sync and close the log file"""
+        with self._lock:
+            self.sync()
+            self._close_file()
+
+    def _get_file(self):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.events_path, "a")
+        return self._file
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class SessionLogRegistry:
+    """
+    Keeps a bounded number of session logs (and their file handles) open.
+    Evicting a log only closes its file; the log reopens it on its next
+    write. While anyone still holds an evicted log, get() hands back that
+    same object, so a session never has two logs with separate sequence
+    numbers and locks appending to one file.
+    """
+
+    def __init__(self, max_open=256):
+        self.max_open = max_open
+        self._logs = OrderedDict()                     # most recently used logs with open files
+        self._live = weakref.WeakValueDictionary()     # every log still referenced anywhere
+        self._lock = threading.Lock()
+
+    def get(self, directory, name="session"):
+        """Get the log for a session directory, opening it if needed"""
+        key = (directory, name)
+        with self._lock:
+            log = self._logs.get(key)
+            if log is not None:
+                self._logs.move_to_end(key)
+                return log
+            log = self._live.get(key)
+            if log is None:
+                log = SessionEventLog(directory, name)
+                self._live[key] = log
+            self._logs[key] = log
+            while len(self._logs) > self.max_open:
+                _, oldest = self._logs.popitem(last=False)
+                oldest.close()
+            return log
+
+    def discard(self, directory, name="session"):
+        """Close and forget the log for a session directory"""
+        with self._lock:
+            log = self._logs.pop((directory, name), None)
+            self._live.pop((directory, name), None)
+        if log is not None:
+            log.close()
+
+    def close_all(self):
+        """Sync and close every open log"""
+        with self._lock:
+            logs = list(self._logs.values())
+            self._logs.clear()
+            self._live.clear()
+        for log in logs:
+            log.close()
+
+# Shared registry of open session logs
+session_logs = SessionLogRegistry(max_open=settings.SESSION_LOG_MAX_OPEN)
@@ -0,0 +1,59 @@
+import os
+import hashlib
+import string
+
+from config import settings
+
+_HEX = set(string.hexdigits.lower())
+
+def shard_parts(session_id, levels=None):
+    """Shard directory names for a session, two hex characters per level"""
+    levels = settings.SESSION_SHARD_LEVELS if levels is None else levels
+    digest = hashlib.md5(session_id.encode("utf-8")).hexdigest()
+    return [digest[i * 2:i * 2 + 2] for i in range(levels)]
+
+def sharded_session_dir(root, session_id, levels=None):
+    """Sharded directory for a session, e.g. sessions/3f/a2/<session_id>"""
+    return os.path.join(root, *shard_parts(session_id, levels), session_id)
+
+def legacy_session_dir(root, session_id):
+    """Flat directory used before sessions were sharded"""
+    return os.path.join(root, session_id)
+
+def session_dir(root, session_id, levels=None):
+    """
+    Directory for a session. Sessions that have not been migrated yet are
+    still found at their legacy flat path.
+    """
+    path = sharded_session_dir(root, session_id, levels)
+    if not os.path.isdir(path):
+        legacy = legacy_session_dir(root, session_id)
+        if os.path.isdir(legacy) and not _is_shard_name(session_id):
+            return legacy
+    return path
+
+def _is_shard_name(name):
+    return len(name) == 2 and set(name) <= _HEX
+
+def iter_session_dirs(root, levels=None):
+    """Yield (session_id, path) for every session directory, sharded or legacy"""
+    levels = settings.SESSION_SHARD_LEVELS if levels is None else levels
+    if not os.path.isdir(root):
+        return
+    for entry in os.scandir(root):
+        if not entry.is_dir():
+            continue
+        if _is_shard_name(entry.name) and levels > 0:
+            yield from _iter_shard(entry.path, levels - 1)
+        else:
+            yield entry.name, entry.path
+
+def _iter_shard(path, levels):
+    for entry in os.scandir(path):
+        if not entry.is_dir():
+            continue
+        if levels > 0:
+            if _is_shard_name(entry.name):
+                yield from _iter_shard(entry.path, levels - 1)
+        else:
+            yield entry.name, entry.path
@@ -0,0 +1,124 @@
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in
+    flight, further calls with the same key wait for its result instead of
+    issuing their own upstream request. Nothing is kept once the call
+    finishes; pair it with a cache for that.
+
+    do() is for blocking callers on worker threads, do_async() for
+    coroutines on an event loop. The two keep separate in-flight tables.
+    Threads waiting on another's call in do() give up after timeout seconds,
+    so a hung upstream call cannot pin every worker thread.
+    """
+
+    def __init__(self, name, timeout=None):
+        self.name = name
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}                                  # key -> Future
+        self._async_calls = weakref.WeakKeyDictionary()   # loop -> {key -> Task}
+
+        # Counters
+        self.calls = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash call parameters into a key"""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def do(self, key, func, *args, **kwargs):
+        """Call func, or wait for the identical call already in flight"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError(f"{self.name} call still in flight after {self.timeout}s") from None
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(self, key, func, *args, **kwargs):
+        """
+        Await func(*args, **kwargs), or the identical call already in flight.
+        The shared call runs as its own task, so one caller going away does
+        not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.get(loop)
+            if calls is None:
+                calls = self._async_calls[loop] = {}
+
+        # Only this loop touches its table, but the counters are shared with do()
+        task = calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            calls[key] = task
+            task.add_done_callback(lambda t: self._finish_async(calls, key, t))
+            with self._lock:
+                self.calls += 1
+        else:
+            with self._lock:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _finish_async(calls, key, task):
+        if calls.get(key) is task:
+            del calls[key]
+        # Retrieve the outcome in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self):
+        """Get in-flight calls and how many callers shared another's call"""
+        with self._lock:
+            in_flight = len(self._calls) + sum(len(calls) for calls in self._async_calls.values())
+        return {
+            "in_flight": in_flight,
+            "calls": self.calls,
+            "shared": self.shared,
+            "timeouts": self.timeouts
+        }
+
+# Shared coalescing for Gemini calls
+llm_flight = SingleFlight("llm", timeout=settings.SINGLE_FLIGHT_TIMEOUT)
+
+# Shared coalescing for Text-to-Speech calls
+tts_flight = SingleFlight("tts", timeout=settings.SINGLE_FLIGHT_TIMEOUT)
@@ -0,0 +1,51 @@
+import re
+
+# Ligatures are expanded and invisible characters (soft hyphen, zero-width
+# spaces, byte order mark) dropped. Only scanned for in non-ASCII text.
+_SPECIAL_CHARS = {
+    "\ufb00": "ff",
+    "\ufb01": "fi",
+    "\ufb02": "fl",
+    "\ufb03": "ffi",
+    "\ufb04": "ffl",
+    "\ufb05": "st",
+    "\ufb06": "st",
+    "\xad": "",
+    "\u200b": "",
+    "\u200c": "",
+    "\u200d": "",
+    "\u2060": "",
+    "\ufeff": "",
+}
+_SPECIAL_RE = re.compile("[" + "".join(_SPECIAL_CHARS) + "]")
+
+def _replace_special(match):
+    return _SPECIAL_CHARS[match.group()]
+
+def normalize_cv_text(text):
+    """
+    Normalize extracted CV text in a single pass over its lines.
+    str.splitlines/str.split do the heavy lifting in C: they recognise every
+    Unicode line break and whitespace character, so tabs, form feeds and
+    non-breaking or typographic spaces collapse into single spaces, and
+    blank lines disappear. Words hyphenated across a line break
+    ("manage-\\nment") are rejoined.
+    """
+    if not text:
+        return ""
+    if not text.isascii():
+        text = _SPECIAL_RE.sub(_replace_special, text)
+
+    lines = []
+    for line in text.splitlines():
+        words = line.split()
+        if not words:
+            continue
+        line = " ".join(words)
+        if lines:
+            prev = lines[-1]
+            if prev[-1] == "-" and prev[-2:-1].islower() and line[0].islower():
+                lines[-1] = prev[:-1] + line
+                continue
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+import os
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the allowed size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+
+@dataclass
+class SavedUpload:
+    path: str
+    size: int
+    sha256: str
+
+def safe_filename(filename, default="upload"):
+    """Strip directory components from a client-supplied filename"""
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    return name if name not in ("", ".", "..") else default
+
+def _open_temp(dest_dir):
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".tmp")
+    return os.fdopen(fd, "wb"), tmp_path
+
+def _finish(f, tmp_path, path):
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+    os.replace(tmp_path, path)
+
+def _discard(f, tmp_path):
+    f.close()
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+async def save_upload(upload, dest_dir, filename, max_bytes=None, chunk_size=None):
+    """
+    Stream an UploadFile to dest_dir/filename in fixed-size chunks.
+    The content is hashed as it is written and the size limit is checked
+    per chunk, so memory use stays at one chunk. Data goes to a temp file in
+    the same directory that is renamed into place once complete; oversized
+    uploads raise UploadTooLarge and leave nothing behind.
+    """
+    max_bytes = max_bytes or settings.MAX_UPLOAD_MB * 1024 * 1024
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
+
+    # Reject early when the client told us the size up front
+    declared = getattr(upload, "size", None)
+    if declared is not None and declared > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    path = os.path.join(dest_dir, safe_filename(filename))
+    digest = hashlib.sha256()
+    size = 0
+
+    f, tmp_path = await run_in_threadpool(_open_temp, dest_dir)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(chunk)
+            await run_in_threadpool(f.write, chunk)
+        await run_in_threadpool(_finish, f, tmp_path, path)
+    except BaseException:
+        await run_in_threadpool(_discard, f, tmp_path)
+        raise
+
+    logger.info(f"Saved upload {path} ({size} bytes)")
+    return SavedUpload(path=path, size=size, sha256=digest.hexdigest())
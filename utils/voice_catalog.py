@@ -0,0 +1,142 @@
+import time
+import logging
+import threading
+
+from config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Used when no voices can be listed
+DEFAULT_VOICE = "en-US-Standard-C"
+
+# Preferred Chirp 3 HD voices, best first
+PRIORITY_CHIRP3_HD_VOICES = [
+    "en-US-Chirp3-HD-Kore",
+    "en-US-Chirp3-HD-Leda",
+    "en-US-Chirp3-HD-Aoede",
+    "en-US-Chirp3-HD-Charon",
+    "en-US-Chirp3-HD-Puck",
+    "en-US-Chirp3-HD-Zephyr"
+]
+
+def select_best_voice(voice_names):
+    """Pick the highest quality voice from a list of voice names"""
+    # Check for Chirp 3 HD voices first (highest quality)
+    chirp3_hd_voices = [v for v in voice_names if "Chirp3-HD" in v]
+    if chirp3_hd_voices:
+        for voice in PRIORITY_CHIRP3_HD_VOICES:
+            if voice in chirp3_hd_voices:
+                return voice
+        return chirp3_hd_voices[0]
+
+    # Then Studio, Neural2 and WaveNet voices
+    for voice_type in ("Studio", "Neural2", "Wavenet"):
+        matches = [v for v in voice_names if voice_type in v]
+        if matches:
+            return matches[0]
+
+    # Fall back to first available voice
+    if voice_names:
+        return voice_names[0]
+
+    return DEFAULT_VOICE
+
+class VoiceCatalog:
+    """
+    Cache of the TTS voice list and the best voice per language code.
+    Entries older than the TTL are still served while a background thread
+    refreshes them, so only the first lookup per language waits on list_voices.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._voices = {}       # language_code -> list of voice names
+        self._fetched_at = {}   # language_code -> timestamp
+        self._best = {}         # language_code -> selected voice name
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get_best_voice(self, client, language_code="en-US"):
+        """Get the best voice for a language, listing voices only when needed"""
+        best = self._best.get(language_code)
+        if best is None:
+            self.misses += 1
+            return self.refresh(client, language_code)
+
+        self.hits += 1
+        if time.time() - self._fetched_at.get(language_code, 0) > self.ttl:
+            self._refresh_in_background(client, language_code)
+        return best
+
+    def has_voice(self, language_code="en-US"):
+        """True if a best voice is cached, so get_best_voice will not call list_voices"""
+        return language_code in self._best
+
+    def get_voices(self, language_code="en-US"):
+        """Get the cached voice names for a language"""
+        return list(self._voices.get(language_code, []))
+
+    def refresh(self, client, language_code="en-US"):
+        """List voices from the API and update the cached selection"""
+        try:
+            voices_response = client.list_voices(language_code=language_code)
+            voice_names = [v.name for v in voices_response.voices]
+        except Exception as e:
+            logger.error(f"Error while listing voices: {str(e)}")
+            # Keep serving the previous selection if there is one
+            return self._best.get(language_code, DEFAULT_VOICE)
+
+        if not voice_names:
+            logger.error("No voices available in Google Cloud TTS")
+
+        best = select_best_voice(voice_names)
+        with self._lock:
+            self._voices[language_code] = voice_names
+            self._fetched_at[language_code] = time.time()
+            self._best[language_code] = best
+            self.refreshes += 1
+
+        logger.info(f"Voice catalogue for {language_code}: {len(voice_names)} voices, using {best}")
+        return best
+
+    def _refresh_in_background(self, client, language_code):
+        """Start a refresh thread unless one is already running"""
+        with self._lock:
+            if language_code in self._refreshing:
+                return
+            self._refreshing.add(language_code)
+
+        def worker():
+            try:
+                self.refresh(client, language_code)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(language_code)
+
+        threading.Thread(target=worker, name=f"voice-refresh-{language_code}", daemon=True).start()
+
+    def clear(self):
+        """Forget all cached voices"""
+        with self._lock:
+            self._voices.clear()
+            self._fetched_at.clear()
+            self._best.clear()
+
+    def get_stats(self):
+        """Get cache counters"""
+        return {
+            "languages": sorted(self._best),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "ttl": self.ttl
+        }
+
+# Shared catalogue for the TTS endpoints
+voice_catalog = VoiceCatalog(ttl=settings.TTS_VOICE_CACHE_TTL)